@@ -0,0 +1,126 @@
+import os
+import time
+from typing import Dict, Optional, Tuple
+
+from . import metrics
+
+# 연결별 전체 메시지 한도 (초당 개수, 순간 최대)
+CONNECTION_RATE = float(os.getenv('ADMISSION_RATE', '20'))
+CONNECTION_BURST = float(os.getenv('ADMISSION_BURST', '40'))
+# 메시지 타입별 한도 (초당 개수, 순간 최대) - 목록에 없는 타입은 "other"
+MESSAGE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "start_game": (0.5, 2),
+    "bet": (5, 10),
+    "ready": (2, 5),
+    "sync": (1, 3),
+    "other": (2, 5),
+}
+# 한도 초과가 이 횟수만큼 쌓이면 (초당 1회씩 회복) 연결 종료
+MAX_STRIKES = float(os.getenv('ADMISSION_MAX_STRIKES', '50'))
+# 연결별 처리 대기 메시지 최대 개수 (넘치면 버림)
+INBOUND_QUEUE_SIZE = int(os.getenv('INBOUND_QUEUE_SIZE', '16'))
+
+# 과부하 판단 기준: 이벤트 루프 지연 (ms) 과 전체 처리 대기 메시지 수
+OVERLOAD_LAG_MS = float(os.getenv('OVERLOAD_LAG_MS', '100'))
+OVERLOAD_PENDING = int(os.getenv('OVERLOAD_PENDING', '2000'))
+
+# 과부하 단계: 1 이면 로비 구독/방 생성 거부, 2 이면 새 입장/관전까지 거부
+# 진행 중인 판의 메시지는 단계와 관계없이 처리한다 (연결별 한도만 적용)
+NORMAL = 0
+SHED_LOBBY = 1
+SHED_JOINS = 2
+
+
+class TokenBucket:
+    """토큰 버킷 (초당 rate 개 회복, 최대 burst 개)"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def allow(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+
+class ConnectionLimiter:
+    """플레이어 연결 하나의 메시지 허용 여부 판단"""
+
+    def __init__(self):
+        self.total = TokenBucket(CONNECTION_RATE, CONNECTION_BURST)
+        self.by_type: Dict[str, TokenBucket] = {}
+        self.strikes = TokenBucket(1, MAX_STRIKES)
+        self.last_notice = 0.0
+
+    def admit(self, message_type: str) -> bool:
+        """메시지 하나를 처리해도 되면 True (타입 한도와 전체 한도 모두 확인)"""
+        kind = message_type if message_type in MESSAGE_LIMITS else "other"
+        bucket = self.by_type.get(kind)
+        if bucket is None:
+            bucket = self.by_type[kind] = TokenBucket(*MESSAGE_LIMITS[kind])
+        now = time.monotonic()
+        return bucket.allow(now) and self.total.allow(now)
+
+    def strike(self) -> bool:
+        """한도 초과 기록, 너무 많이 쌓였으면 False (연결 종료 대상)"""
+        return self.strikes.allow()
+
+    def should_notify(self) -> bool:
+        """한도 초과 안내는 초당 한 번만"""
+        now = time.monotonic()
+        if now - self.last_notice < 1:
+            return False
+        self.last_notice = now
+        return True
+
+
+class LoadShedder:
+    """이벤트 루프 지연과 처리 대기 메시지 수로 서버 과부하 단계 판단
+
+    지연은 metrics.monitor_event_loop_lag 의 측정값을 observe_lag 로 받는다.
+    """
+
+    def __init__(self, lag_ms: float = OVERLOAD_LAG_MS, max_pending: int = OVERLOAD_PENDING):
+        self.lag_threshold = lag_ms / 1000
+        self.max_pending = max_pending
+        self.lag = 0.0  # 지수 이동 평균 (초)
+        self.pending = 0
+        self.level = NORMAL
+
+    def _update_level(self):
+        if self.lag >= self.lag_threshold * 2 or self.pending >= self.max_pending * 2:
+            self.level = SHED_JOINS
+        elif self.lag >= self.lag_threshold or self.pending >= self.max_pending:
+            self.level = SHED_LOBBY
+        else:
+            self.level = NORMAL
+
+    def admit(self, scope: str, min_level: int) -> bool:
+        """과부하 단계가 min_level 이상이면 scope 요청 거부 (결정은 메트릭으로 기록)"""
+        admitted = self.level < min_level
+        metrics.admission_decisions.inc(scope, "admitted" if admitted else "shed")
+        return admitted
+
+    def queued(self, count: int = 1):
+        """처리 대기 메시지 수 변경"""
+        self.pending += count
+
+    def observe_lag(self, lag: float):
+        """이벤트 루프 지연 측정값 반영 (초)"""
+        self.lag = self.lag * 0.7 + lag * 0.3
+        self._update_level()
+
+
+shedder = LoadShedder()
+metrics.lag_listeners.append(shedder.observe_lag)
+metrics.overload_level.set_function(lambda: {(): shedder.level})
+metrics.inbound_pending.set_function(lambda: {(): shedder.pending})
@@ -0,0 +1,83 @@
+import asyncio
+import gzip
+import json
+import os
+from typing import Dict, List
+
+from .database import history_cutoff, history_period_end
+
+# 최근 몇 개 기간(월 또는 일)의 게임 기록을 DB 에 남겨둘지
+HOT_PERIODS = int(os.getenv('HISTORY_HOT_PERIODS', '2'))
+# 보관 파일 위치와 한 번에 읽는 행 수
+ARCHIVE_DIR = os.getenv('HISTORY_ARCHIVE_DIR', 'archive')
+ARCHIVE_CHUNK_SIZE = int(os.getenv('HISTORY_ARCHIVE_CHUNK_SIZE', '1000'))
+# 보관 작업 주기 (초)
+ARCHIVE_INTERVAL = float(os.getenv('HISTORY_ARCHIVE_INTERVAL', '3600'))
+
+
+def _write_rows(archive, rows: List[Dict]):
+    """행을 JSON Lines 로 압축 파일에 기록 (스레드에서 실행)"""
+    for row in rows:
+        if isinstance(row.get("game_data"), (str, bytes)):
+            row["game_data"] = json.loads(row["game_data"])
+        archive.write((json.dumps(row, ensure_ascii=False, default=str) + "\n").encode())
+
+
+class HistoryArchiver:
+    """오래된 기간별 게임 기록 테이블을 gzip JSON Lines 파일로 옮긴 뒤 테이블 삭제
+
+    테이블을 ARCHIVE_CHUNK_SIZE 행씩 id 순으로 읽어 임시 파일에 이어 쓰고, 다 쓰면
+    파일 이름을 바꾼 다음 테이블을 삭제한다. 압축과 파일 쓰기는 스레드에서 처리한다.
+    중간에 멈추면 다음 주기에 처음부터 다시 쓴다.
+    """
+
+    def __init__(self, db, directory: str = ARCHIVE_DIR):
+        self.db = db
+        self.directory = directory
+
+    def path_for(self, table: str) -> str:
+        return os.path.join(self.directory, f"{table}.jsonl.gz")
+
+    async def archive_table(self, table: str) -> int:
+        """테이블 하나를 파일로 옮기고 행 수 반환"""
+        path = self.path_for(table)
+        rows_written = 0
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            partial = path + ".part"
+            archive = gzip.open(partial, "wb")
+            try:
+                last_id = 0
+                while True:
+                    rows = await self.db.get_history_chunk(table, last_id, ARCHIVE_CHUNK_SIZE)
+                    if not rows:
+                        break
+                    await asyncio.to_thread(_write_rows, archive, rows)
+                    rows_written += len(rows)
+                    last_id = rows[-1]["id"]
+            finally:
+                await asyncio.to_thread(archive.close)
+            os.replace(partial, path)
+        await self.db.drop_history_table(table)
+        return rows_written
+
+    async def archive_expired(self) -> Dict[str, int]:
+        """보관 기간이 지난 테이블 전부 처리"""
+        cutoff = history_cutoff(HOT_PERIODS)
+        results = {}
+        for table in await self.db.list_history_tables():
+            period_end = history_period_end(table)
+            if period_end is not None and period_end <= cutoff:
+                results[table] = await self.archive_table(table)
+        if results:
+            print(f"Archived game history: {results}")
+        return results
+
+    async def run(self):
+        """주기적 보관 작업"""
+        while True:
+            try:
+                await self.archive_expired()
+            except Exception as e:
+                print(f"History archive error: {e}")
+            await asyncio.sleep(ARCHIVE_INTERVAL)
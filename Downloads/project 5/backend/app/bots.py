@@ -0,0 +1,176 @@
+import asyncio
+import itertools
+import multiprocessing
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .dealer import DECK
+from .game_logic import SeotdaGame
+from .models import Card
+
+# 봇 결정을 계산하는 워커 프로세스 수 (0 이면 기본 스레드 풀 사용)
+BOT_WORKERS = int(os.getenv('BOT_WORKERS', '2'))
+# 결정 요청을 모으는 시간 (초) 과 워커 하나에 보내는 최대 개수
+BATCH_WINDOW = float(os.getenv('BOT_BATCH_WINDOW', '0.05'))
+BATCH_SIZE = int(os.getenv('BOT_BATCH_SIZE', '256'))
+# 워커 풀이 연달아 깨졌을 때 다시 만드는 횟수와 첫 대기 시간 (초, 매번 두 배)
+# 횟수를 넘기면 (spawn 직후 죽는 경우 등) 스레드 풀로 계산
+POOL_RETRIES = int(os.getenv('BOT_POOL_RETRIES', '3'))
+POOL_BACKOFF = float(os.getenv('BOT_POOL_BACKOFF', '1'))
+# 봇 시작 칩과 봇이 더 올리지 않는 베팅 상한
+BOT_CHIPS = int(os.getenv('BOT_CHIPS', '1000'))
+RAISE_CAP = int(os.getenv('BOT_RAISE_CAP', '50'))
+# 이 승률 이상이면 레이즈 고려
+RAISE_EQUITY = 0.75
+
+_evaluator = SeotdaGame()
+
+
+def build_equity_table() -> Dict[tuple, float]:
+    """패 점수별 1:1 승률 (나머지 카드로 만들 수 있는 모든 상대 패와 비교, 비기면 0.5)"""
+    totals: Dict[tuple, List[float]] = {}
+    indices = range(len(DECK))
+    for mine in itertools.combinations(indices, 2):
+        value = _evaluator.get_hand_value([DECK[i] for i in mine])
+        rest = [i for i in indices if i not in mine]
+        score = 0.0
+        count = 0
+        for theirs in itertools.combinations(rest, 2):
+            other = _evaluator.get_hand_value([DECK[i] for i in theirs])
+            score += 1.0 if value > other else 0.5 if value == other else 0.0
+            count += 1
+        entry = totals.setdefault(value, [0.0, 0])
+        entry[0] += score / count
+        entry[1] += 1
+    return {value: total / hands for value, (total, hands) in totals.items()}
+
+
+EQUITY = build_equity_table()
+
+
+def decide(cards: List[Tuple[str, int]], opponents: int, to_call: int, pot: int,
+           chips: int, can_raise: bool, roll: float) -> Tuple[str, int]:
+    """봇 베팅 결정 (action, amount)
+
+    승률은 1:1 승률을 상대 수만큼 거듭제곱해 근사하고, 콜 금액 대비 팟 비율과 비교한다.
+    """
+    value = _evaluator.get_hand_value([Card(suit=suit, number=number) for suit, number in cards])
+    equity = EQUITY.get(value, 0.5) ** max(1, opponents)
+
+    if to_call >= chips:
+        # 콜할 칩이 부족하면 올인 또는 다이
+        return ("all_in", 0) if chips and equity >= 0.5 else ("fold", 0)
+
+    if can_raise and equity >= RAISE_EQUITY and roll < 0.8:
+        if roll < 0.3 and to_call == 0 and to_call + pot // 2 <= chips:
+            return ("half", 0)
+        amount = max(10, pot // 4)
+        if to_call + amount <= chips:
+            return ("raise", amount)
+
+    pot_odds = to_call / (pot + to_call) if to_call else 0.0
+    if equity + (roll - 0.5) * 0.1 >= pot_odds:
+        return ("call", 0)
+    return ("fold", 0)
+
+
+def decide_batch(requests: List[tuple]) -> List[Tuple[str, int]]:
+    """워커에서 실행: (cards, opponents, to_call, pot, chips, can_raise) 목록에 대한 결정"""
+    return [decide(*request, random.random()) for request in requests]
+
+
+class BotDriver:
+    """모든 방의 봇 차례를 모아 워커 풀에서 일괄 결정하고 이벤트 루프에서 적용
+
+    request 는 await 없이 대기열에만 넣는다. 실행 루프는 BATCH_WINDOW 동안 요청을 모은 뒤
+    BATCH_SIZE 씩 나눠 워커들에 동시에 보내고, 결과를 apply 콜백(베팅 처리)으로 넘긴다.
+    """
+
+    def __init__(self, apply: Callable[[str, str, int, str, int], Awaitable[None]]):
+        self.apply = apply
+        # (방 id, 봇 id) -> (판 번호, 결정 입력)
+        self.pending: Dict[Tuple[str, str], Tuple[int, tuple]] = {}
+        self.inflight: Dict[Tuple[str, str], None] = {}
+        self.wakeup: Optional[asyncio.Event] = None
+        self.executor = None
+        self.workers = BOT_WORKERS
+        self.pool_failures = 0  # 연속으로 풀이 깨진 횟수
+
+    def start(self):
+        self.wakeup = asyncio.Event()
+        self._create_executor()
+        asyncio.create_task(self.run())
+
+    def _create_executor(self):
+        if self.workers > 0:
+            # 서버 프로세스의 스레드를 물려받지 않도록 spawn 사용
+            self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                mp_context=multiprocessing.get_context("spawn"))
+
+    def stop(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def request(self, room, bot):
+        """봇 차례가 되면 호출 (같은 차례에 대한 중복 요청은 무시)"""
+        key = (room.room_id, bot.id)
+        if self.wakeup is None or key in self.pending or key in self.inflight:
+            return
+        opponents = sum(1 for p in room.players if p is not bot and not p.folded)
+        self.pending[key] = (room.hand_number, (
+            [(c.suit, c.number) for c in bot.cards],
+            opponents,
+            max(0, room.current_bet - bot.current_bet),
+            room.current_pot,
+            bot.chips,
+            room.current_bet < RAISE_CAP,
+        ))
+        self.wakeup.set()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.wakeup.wait()
+            await asyncio.sleep(BATCH_WINDOW)
+            self.wakeup.clear()
+            batch = list(self.pending.items())
+            self.pending = {}
+            for key, _ in batch:
+                self.inflight[key] = None
+            try:
+                chunks = [batch[i:i + BATCH_SIZE] for i in range(0, len(batch), BATCH_SIZE)]
+                results = await asyncio.gather(*(
+                    loop.run_in_executor(self.executor, decide_batch, [inputs for _, (_, inputs) in chunk])
+                    for chunk in chunks
+                ))
+                self.pool_failures = 0
+                for chunk, decisions in zip(chunks, results):
+                    for ((room_id, bot_id), (hand_number, _)), (action, amount) in zip(chunk, decisions):
+                        self.inflight.pop((room_id, bot_id), None)
+                        try:
+                            await self.apply(room_id, bot_id, hand_number, action, amount)
+                        except Exception as e:
+                            print(f"Bot action error: {e}")
+            except BrokenProcessPool as e:
+                # 워커가 죽으면 점점 길게 기다린 뒤 풀을 새로 만들고 이번 요청은 다시 대기열로
+                self.pool_failures += 1
+                self.stop()
+                if self.pool_failures > POOL_RETRIES:
+                    print(f"Bot worker pool failed {self.pool_failures} times, using threads: {e}")
+                    self.workers = 0
+                else:
+                    print(f"Bot worker pool error ({self.pool_failures}/{POOL_RETRIES}): {e}")
+                    await asyncio.sleep(POOL_BACKOFF * 2 ** (self.pool_failures - 1))
+                    self._create_executor()
+                for key, value in batch:
+                    self.pending.setdefault(key, value)
+                self.wakeup.set()
+            except Exception as e:
+                print(f"Bot decision error: {e}")
+            finally:
+                for key, _ in batch:
+                    self.inflight.pop(key, None)
@@ -1,12 +1,187 @@
+from abc import ABC, abstractmethod
 import mysql.connector
 from mysql.connector import Error
 import os
 import json
+import re
+from datetime import datetime, timedelta
 from typing import Optional, List, Dict
+from .metrics import track_db_query
 
-class Database:
+# 테이블 구조를 바꾸면 올려야 함 (같으면 시작 시 DDL 생략)
+# 2: game_history 를 기간별 테이블(game_history_YYYYMM[DD])로 분리
+SCHEMA_VERSION = 2
+
+# 저장소 종류 (mysql: 네트워크 MySQL 서버, sqlite: 로컬 파일 내장 DB)
+DB_BACKEND = os.getenv('DB_BACKEND', 'mysql')
+
+# 게임 기록 테이블 분리 단위 (month 또는 day)
+HISTORY_PARTITION = os.getenv('HISTORY_PARTITION', 'month')
+HISTORY_PREFIX = "game_history_"
+HISTORY_TABLE_PATTERN = re.compile(r"^game_history_(\d{6}|\d{8})$")
+
+def history_table_name(when: Optional[datetime] = None) -> str:
+    """게임 결과를 기록할 기간별 테이블 이름 (UTC 기준)"""
+    when = when or datetime.utcnow()
+    return HISTORY_PREFIX + when.strftime('%Y%m%d' if HISTORY_PARTITION == 'day' else '%Y%m')
+
+def history_period_end(table: str) -> Optional[datetime]:
+    """기간별 테이블이 담당하는 기간의 끝 (기간별 테이블이 아니면 None)"""
+    match = HISTORY_TABLE_PATTERN.match(table)
+    if not match:
+        return None
+    suffix = match.group(1)
+    if len(suffix) == 8:
+        return datetime.strptime(suffix, '%Y%m%d') + timedelta(days=1)
+    start = datetime.strptime(suffix, '%Y%m')
+    return start.replace(year=start.year + start.month // 12, month=start.month % 12 + 1)
+
+def history_cutoff(keep: int, now: Optional[datetime] = None) -> datetime:
+    """현재 기간을 포함해 최근 keep 개 기간의 시작 (이보다 먼저 끝난 테이블은 보관 대상)"""
+    now = now or datetime.utcnow()
+    if HISTORY_PARTITION == 'day':
+        return datetime(now.year, now.month, now.day) - timedelta(days=keep - 1)
+    months = now.year * 12 + now.month - 1 - (keep - 1)
+    return datetime(months // 12, months % 12 + 1, 1)
+
+class Database(ABC):
+    """저장소 인터페이스 (백엔드마다 같은 의미로 구현, 빠진 메서드가 있으면 생성 시 TypeError)"""
+    
+    # 마지막 스키마 준비 실패 사유 (성공하면 None)
+    schema_error: Optional[str] = None
+    
+    @abstractmethod
+    async def init_database(self) -> bool:
+        """스키마 준비 (DDL 을 실행해 성공했으면 True, 최신이라 생략했거나 실패하면 False)"""
+    
+    @abstractmethod
+    async def create_room(self, room_data: dict):
+        """게임룸 생성"""
+    
+    @abstractmethod
+    async def create_rooms(self, rooms: List[dict]):
+        """게임룸 여러 개를 한 번에 생성 (한 트랜잭션)"""
+    
+    @abstractmethod
+    async def get_all_rooms(self) -> List[Dict]:
+        """모든 게임룸과 현재 인원 수 (최근 생성 순)"""
+    
+    @abstractmethod
+    async def get_live_rooms(self) -> List[Dict]:
+        """메모리 워밍업용 전체 게임룸과 인원 수"""
+    
+    @abstractmethod
+    async def reset_interrupted_games(self) -> int:
+        """진행 중이던 게임을 대기 상태로 되돌리고 개수 반환"""
+    
+    @abstractmethod
+    async def clear_players(self) -> int:
+        """이전 프로세스가 남긴 플레이어 행을 모두 삭제하고 개수 반환 (방 인원 수는 0)"""
+    
+    @abstractmethod
+    async def get_room_by_id(self, room_id: str) -> Optional[Dict]:
+        """특정 게임룸 조회 (없으면 None)"""
+    
+    @abstractmethod
+    async def update_room(self, room_id: str, room_data: dict):
+        """게임룸 정보 수정 (room_data 에 있는 필드만)"""
+    
+    @abstractmethod
+    async def delete_room(self, room_id: str):
+        """게임룸 삭제 (플레이어도 함께 삭제)"""
+    
+    @abstractmethod
+    async def add_player_to_room(self, room_id: str, player_id: str, player_name: str):
+        """플레이어를 게임룸에 추가"""
+    
+    @abstractmethod
+    async def remove_player_from_room(self, room_id: str, player_id: str):
+        """플레이어를 게임룸에서 제거"""
+    
+    @abstractmethod
+    async def get_room_players(self, room_id: str) -> List[Dict]:
+        """방의 플레이어 목록 (입장 순)"""
+    
+    @abstractmethod
+    async def update_room_status(self, room_id: str, status: str):
+        """방 상태 업데이트"""
+    
+    @abstractmethod
+    async def save_game_state(self, room_id: str, game_data: dict):
+        """게임 상태 저장"""
+    
+    @abstractmethod
+    async def save_game_result(self, room_id: str, winner_id: str, pot_amount: int, game_data: dict):
+        """게임 결과 저장"""
+    
+    @abstractmethod
+    async def list_history_tables(self) -> List[str]:
+        """기간별 게임 기록 테이블 목록 (이름순)"""
+    
+    @abstractmethod
+    async def get_history_chunk(self, table: str, after_id: int, limit: int) -> List[Dict]:
+        """기록 테이블에서 after_id 다음 행부터 limit 개 (id 순)"""
+    
+    @abstractmethod
+    async def drop_history_table(self, table: str):
+        """보관이 끝난 기록 테이블 삭제"""
+    
+    @abstractmethod
+    async def get_stale_players(self, older_than_seconds: int) -> List[Dict]:
+        """older_than_seconds 이전에 입장한 플레이어 행 (id, room_id)"""
+    
+    @abstractmethod
+    async def delete_players(self, player_ids: list):
+        """플레이어 행 일괄 삭제 및 방 인원 수 갱신"""
+    
+    @abstractmethod
+    async def get_idle_empty_rooms(self, older_than_seconds: int) -> List[str]:
+        """플레이어가 없고 older_than_seconds 동안 변경되지 않은 방 id"""
+    
+    @abstractmethod
+    async def delete_rooms(self, room_ids: list):
+        """게임룸 일괄 삭제"""
+    
+    @abstractmethod
+    async def get_chip_balance(self, account: str) -> Optional[int]:
+        """계정 칩 잔액 조회 (기록이 없으면 None)"""
+    
+    @abstractmethod
+    async def append_ledger_entries(self, entries: list):
+        """칩 원장 일괄 기록 및 잔액/좌석 칩 갱신 (한 트랜잭션)"""
+    
+    @abstractmethod
+    async def get_ledger_balances(self, accounts: list) -> Dict[str, int]:
+        """계정별 원장 합계"""
+    
+    @abstractmethod
+    async def get_all_player_stats(self) -> List[Dict]:
+        """저장된 플레이어 통계 전체 조회"""
+    
+    @abstractmethod
+    async def save_player_stats(self, stats: List[Dict]):
+        """플레이어 통계 일괄 저장"""
+    
+    @abstractmethod
+    async def close(self):
+        """연결 종료"""
+
+def create_database() -> Database:
+    """DB_BACKEND 설정에 맞는 저장소 생성"""
+    if DB_BACKEND == 'sqlite':
+        from .sqlite_database import SQLiteDatabase
+        return SQLiteDatabase()
+    if DB_BACKEND != 'mysql':
+        raise ValueError(f"Unknown DB_BACKEND: {DB_BACKEND}")
+    return MySQLDatabase()
+
+class MySQLDatabase(Database):
+    """MySQL 서버 저장소"""
+    
     def __init__(self):
         self.connection = None
+        # 이미 만든 기간별 기록 테이블
+        self.history_tables = set()
         self.host = os.getenv('DB_HOST', 'host.docker.internal')  # ✅ 기본값 수정
         self.database = os.getenv('DB_NAME', 'poker_db')
         self.user = os.getenv('DB_USER', 'root')
@@ -28,8 +203,38 @@ class Database:
         except Error as e:
             print(f"Database connection error: {e}")
             return False
-    async def init_database(self):
-        """데이터베이스 초기화"""
+    
+    def get_schema_version(self) -> Optional[int]:
+        """저장된 스키마 버전 (테이블이 없으면 None)"""
+        try:
+            cursor = self.connection.cursor()
+            cursor.execute("SELECT version FROM schema_version LIMIT 1")
+            row = cursor.fetchone()
+            cursor.close()
+            return row[0] if row else None
+        except Error:
+            return None
+    
+    async def init_database(self) -> bool:
+        """데이터베이스 초기화 (스키마가 최신이면 DDL 생략, DDL 을 실행해 성공했으면 True)"""
+        self.schema_error = None
+        # 기존 DB 에 바로 연결해 스키마 버전 확인
+        try:
+            self.connection = mysql.connector.connect(
+                host=self.host,
+                database=self.database,
+                user=self.user,
+                password=self.password,
+                port=self.port,
+                autocommit=True
+            )
+            if self.get_schema_version() == SCHEMA_VERSION:
+                print(f"Database schema is up to date (version {SCHEMA_VERSION})")
+                return False
+        except Error:
+            # DB 가 아직 없음
+            pass
+        
         try:
             connection = mysql.connector.connect(
                 host=self.host,
@@ -44,6 +249,10 @@ class Database:
             cursor.close()
             connection.close()
             
+            # 스키마 버전 확인에 쓴 연결은 닫고 다시 연결
+            if self.connection:
+                self.connection.close()
+                self.connection = None
             await self.connect()
             
             if self.connection and self.connection.is_connected():
@@ -84,24 +293,70 @@ class Database:
                     )
                 """)
                 
-                # 게임 히스토리 테이블
+                # 게임 히스토리는 기간별 테이블에 기록 (save_game_result 에서 생성)
+                # 이전 버전의 단일 game_history 테이블은 현재 기간 테이블로 옮김
+                table = history_table_name()
+                cursor.execute(
+                    "SELECT table_name FROM information_schema.tables "
+                    "WHERE table_schema = DATABASE() AND table_name IN ('game_history', %s)",
+                    (table,)
+                )
+                if {row[0] for row in cursor.fetchall()} == {'game_history'}:
+                    cursor.execute(f"RENAME TABLE game_history TO {table}")
+                    cursor.execute(f"ALTER TABLE {table} ADD INDEX idx_room_id (room_id)")
+                
+                # 칩 원장 (추가만 가능)
                 cursor.execute("""
-                    CREATE TABLE IF NOT EXISTS game_history (
-                        id INT AUTO_INCREMENT PRIMARY KEY,
+                    CREATE TABLE IF NOT EXISTS chip_ledger (
+                        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+                        account VARCHAR(100) NOT NULL,
+                        player_id VARCHAR(50),
                         room_id VARCHAR(50),
-                        winner_id VARCHAR(50),
-                        pot_amount INT,
-                        game_data JSON,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                        delta INT NOT NULL,
+                        reason VARCHAR(20) NOT NULL,
+                        balance_after INT NOT NULL,
+                        created_at TIMESTAMP(3) DEFAULT CURRENT_TIMESTAMP(3),
+                        INDEX idx_chip_ledger_account (account)
                     )
                 """)
                 
+                # 계정별 마지막 잔액 (원장 flush 시 갱신)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS chip_balances (
+                        account VARCHAR(100) PRIMARY KEY,
+                        balance INT NOT NULL,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+                    )
+                """)
+                
+                # 플레이어 누적 통계 (순위표는 메모리에서 유지, 주기적으로 체크포인트)
+                cursor.execute("""
+                    CREATE TABLE IF NOT EXISTS player_stats (
+                        account VARCHAR(100) PRIMARY KEY,
+                        hands_played INT NOT NULL DEFAULT 0,
+                        hands_won INT NOT NULL DEFAULT 0,
+                        biggest_pot INT NOT NULL DEFAULT 0,
+                        net_chips BIGINT NOT NULL DEFAULT 0,
+                        hand_types JSON,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+                    )
+                """)
+                
+                # 스키마 버전 기록
+                cursor.execute("CREATE TABLE IF NOT EXISTS schema_version (version INT NOT NULL)")
+                cursor.execute("DELETE FROM schema_version")
+                cursor.execute("INSERT INTO schema_version (version) VALUES (%s)", (SCHEMA_VERSION,))
+                
                 cursor.close()
                 print("Database initialized successfully")
                 
         except Error as e:
             print(f"Database initialization error: {e}")
+            self.schema_error = str(e)
+            return False
+        return True
     
+    @track_db_query
     async def create_room(self, room_data: dict):
         """게임룸 생성"""
         if not self.connection or not self.connection.is_connected():
@@ -123,6 +378,38 @@ class Database:
         ))
         cursor.close()
     
+    @track_db_query
+    async def create_rooms(self, rooms: List[dict]):
+        """게임룸 일괄 생성 (토너먼트 테이블 등)"""
+        if not rooms:
+            return
+        if not self.connection or not self.connection.is_connected():
+            await self.connect()
+        
+        cursor = self.connection.cursor()
+        try:
+            self.connection.start_transaction()
+            cursor.executemany(
+                "INSERT INTO game_rooms (id, name, description, max_players, is_private, password, created_by) "
+                "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                [(
+                    room['id'],
+                    room['name'],
+                    room.get('description', ''),
+                    room.get('max_players', 4),
+                    room.get('is_private', False),
+                    room.get('password'),
+                    room.get('created_by')
+                ) for room in rooms]
+            )
+            self.connection.commit()
+        except Error:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    @track_db_query
     async def get_all_rooms(self):
         """모든 게임룸 조회"""
         if not self.connection or not self.connection.is_connected():
@@ -142,6 +429,52 @@ class Database:
         cursor.close()
         return rooms
     
+    @track_db_query
+    async def get_live_rooms(self):
+        """메모리 워밍업용 전체 게임룸과 인원 수 (한 번의 쿼리)"""
+        if not self.connection or not self.connection.is_connected():
+            await self.connect()
+        
+        cursor = self.connection.cursor(dictionary=True)
+        query = """
+            SELECT r.id, r.max_players, r.is_private, r.status,
+                   COUNT(p.id) as current_players
+            FROM game_rooms r
+            LEFT JOIN players p ON r.id = p.room_id
+            GROUP BY r.id
+        """
+        cursor.execute(query)
+        rooms = cursor.fetchall()
+        cursor.close()
+        return rooms
+    
+    @track_db_query
+    async def reset_interrupted_games(self):
+        """재시작으로 끊긴 게임을 대기 상태로 되돌림"""
+        if not self.connection or not self.connection.is_connected():
+            await self.connect()
+        
+        cursor = self.connection.cursor()
+        query = "UPDATE game_rooms SET status = 'waiting', current_pot = 0, current_bet = 0 WHERE status = 'playing'"
+        cursor.execute(query)
+        count = cursor.rowcount
+        cursor.close()
+        return count
+    
+    @track_db_query
+    async def clear_players(self):
+        """재시작 전 접속해 있던 플레이어 행 삭제 (메모리에 없는 자리이므로 모두 정리)"""
+        if not self.connection or not self.connection.is_connected():
+            await self.connect()
+        
+        cursor = self.connection.cursor()
+        cursor.execute("DELETE FROM players")
+        count = cursor.rowcount
+        cursor.execute("UPDATE game_rooms SET current_players = 0 WHERE current_players <> 0")
+        cursor.close()
+        return count
+    
+    @track_db_query
     async def get_room_by_id(self, room_id: str):
         """특정 게임룸 조회"""
         if not self.connection or not self.connection.is_connected():
@@ -161,6 +494,7 @@ class Database:
         cursor.close()
         return room
     
+    @track_db_query
     async def update_room(self, room_id: str, room_data: dict):
         """게임룸 정보 수정"""
         if not self.connection or not self.connection.is_connected():
@@ -199,6 +533,7 @@ class Database:
         
         cursor.close()
     
+    @track_db_query
     async def delete_room(self, room_id: str):
         """게임룸 삭제"""
         if not self.connection or not self.connection.is_connected():
@@ -209,6 +544,7 @@ class Database:
         cursor.execute(query, (room_id,))
         cursor.close()
     
+    @track_db_query
     async def add_player_to_room(self, room_id: str, player_id: str, player_name: str):
         """플레이어를 게임룸에 추가"""
         if not self.connection or not self.connection.is_connected():
@@ -230,6 +566,7 @@ class Database:
         
         cursor.close()
     
+    @track_db_query
     async def remove_player_from_room(self, room_id: str, player_id: str):
         """플레이어를 게임룸에서 제거"""
         if not self.connection or not self.connection.is_connected():
@@ -251,6 +588,7 @@ class Database:
         
         cursor.close()
     
+    @track_db_query
     async def get_room_players(self, room_id: str):
         """방의 플레이어 목록 조회"""
         if not self.connection or not self.connection.is_connected():
@@ -263,6 +601,7 @@ class Database:
         cursor.close()
         return players
     
+    @track_db_query
     async def update_room_status(self, room_id: str, status: str):
         """방 상태 업데이트"""
         if not self.connection or not self.connection.is_connected():
@@ -273,6 +612,7 @@ class Database:
         cursor.execute(query, (status, room_id))
         cursor.close()
     
+    @track_db_query
     async def save_game_state(self, room_id: str, game_data: dict):
         """게임 상태 저장"""
         if not self.connection or not self.connection.is_connected():
@@ -288,16 +628,250 @@ class Database:
         ))
         cursor.close()
     
+    @track_db_query
     async def save_game_result(self, room_id: str, winner_id: str, pot_amount: int, game_data: dict):
-        """게임 결과 저장"""
+        """게임 결과 저장 (현재 기간 테이블)"""
         if not self.connection or not self.connection.is_connected():
             await self.connect()
         
         cursor = self.connection.cursor()
-        query = "INSERT INTO game_history (room_id, winner_id, pot_amount, game_data) VALUES (%s, %s, %s, %s)"
+        table = history_table_name()
+        if table not in self.history_tables:
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id INT AUTO_INCREMENT PRIMARY KEY,
+                    room_id VARCHAR(50),
+                    winner_id VARCHAR(50),
+                    pot_amount INT,
+                    game_data JSON,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    INDEX idx_room_id (room_id)
+                )
+            """)
+            self.history_tables.add(table)
+        query = f"INSERT INTO {table} (room_id, winner_id, pot_amount, game_data) VALUES (%s, %s, %s, %s)"
         cursor.execute(query, (room_id, winner_id, pot_amount, json.dumps(game_data)))
         cursor.close()
     
+    @track_db_query
+    async def list_history_tables(self) -> List[str]:
+        """기간별 게임 기록 테이블 목록"""
+        if not self.connection or not self.connection.is_connected():
+            await self.connect()
+        
+        cursor = self.connection.cursor()
+        cursor.execute(
+            "SELECT table_name FROM information_schema.tables "
+            "WHERE table_schema = DATABASE() AND table_name LIKE 'game\\_history\\_%'"
+        )
+        tables = sorted(row[0] for row in cursor.fetchall() if HISTORY_TABLE_PATTERN.match(row[0]))
+        cursor.close()
+        return tables
+    
+    @track_db_query
+    async def get_history_chunk(self, table: str, after_id: int, limit: int) -> List[Dict]:
+        """기록 테이블을 id 순으로 나눠 읽기 (보관용)"""
+        if not HISTORY_TABLE_PATTERN.match(table):
+            raise ValueError(f"Not a history table: {table}")
+        if not self.connection or not self.connection.is_connected():
+            await self.connect()
+        
+        cursor = self.connection.cursor(dictionary=True)
+        query = f"""
+            SELECT id, room_id, winner_id, pot_amount, game_data, created_at
+            FROM {table} WHERE id > %s ORDER BY id LIMIT %s
+        """
+        cursor.execute(query, (after_id, limit))
+        rows = cursor.fetchall()
+        cursor.close()
+        return rows
+    
+    @track_db_query
+    async def drop_history_table(self, table: str):
+        """보관이 끝난 기록 테이블 삭제"""
+        if not HISTORY_TABLE_PATTERN.match(table):
+            raise ValueError(f"Not a history table: {table}")
+        if not self.connection or not self.connection.is_connected():
+            await self.connect()
+        
+        cursor = self.connection.cursor()
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+        cursor.close()
+        self.history_tables.discard(table)
+    
+    @track_db_query
+    async def get_stale_players(self, older_than_seconds: int) -> List[Dict]:
+        """일정 시간 이전에 입장한 플레이어 행 (정리 대상 후보)"""
+        if not self.connection or not self.connection.is_connected():
+            await self.connect()
+        
+        cursor = self.connection.cursor(dictionary=True)
+        query = "SELECT id, room_id FROM players WHERE created_at < NOW() - INTERVAL %s SECOND"
+        cursor.execute(query, (older_than_seconds,))
+        players = cursor.fetchall()
+        cursor.close()
+        return players
+    
+    @track_db_query
+    async def delete_players(self, player_ids: list):
+        """플레이어 행 일괄 삭제 및 방 인원 수 갱신"""
+        if not player_ids:
+            return
+        if not self.connection or not self.connection.is_connected():
+            await self.connect()
+        
+        cursor = self.connection.cursor()
+        placeholders = ", ".join(["%s"] * len(player_ids))
+        cursor.execute(f"SELECT DISTINCT room_id FROM players WHERE id IN ({placeholders})", tuple(player_ids))
+        room_ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute(f"DELETE FROM players WHERE id IN ({placeholders})", tuple(player_ids))
+        cursor.executemany(
+            "UPDATE game_rooms SET current_players = (SELECT COUNT(*) FROM players WHERE room_id = %s) WHERE id = %s",
+            [(room_id, room_id) for room_id in room_ids]
+        )
+        cursor.close()
+    
+    @track_db_query
+    async def get_idle_empty_rooms(self, older_than_seconds: int) -> List[str]:
+        """플레이어가 없고 오래 변경되지 않은 방"""
+        if not self.connection or not self.connection.is_connected():
+            await self.connect()
+        
+        cursor = self.connection.cursor()
+        query = """
+            SELECT r.id FROM game_rooms r
+            LEFT JOIN players p ON r.id = p.room_id
+            WHERE p.id IS NULL AND r.updated_at < NOW() - INTERVAL %s SECOND
+        """
+        cursor.execute(query, (older_than_seconds,))
+        room_ids = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+        return room_ids
+    
+    @track_db_query
+    async def delete_rooms(self, room_ids: list):
+        """게임룸 일괄 삭제"""
+        if not room_ids:
+            return
+        if not self.connection or not self.connection.is_connected():
+            await self.connect()
+        
+        cursor = self.connection.cursor()
+        placeholders = ", ".join(["%s"] * len(room_ids))
+        cursor.execute(f"DELETE FROM game_rooms WHERE id IN ({placeholders})", tuple(room_ids))
+        cursor.close()
+    
+    @track_db_query
+    async def get_chip_balance(self, account: str) -> Optional[int]:
+        """계정 칩 잔액 조회 (기록이 없으면 None)"""
+        if not self.connection or not self.connection.is_connected():
+            await self.connect()
+        
+        cursor = self.connection.cursor()
+        query = "SELECT balance FROM chip_balances WHERE account = %s"
+        cursor.execute(query, (account,))
+        row = cursor.fetchone()
+        cursor.close()
+        return row[0] if row else None
+    
+    @track_db_query
+    async def append_ledger_entries(self, entries: list):
+        """칩 원장 일괄 기록 및 잔액/좌석 칩 갱신 (한 트랜잭션)"""
+        if not entries:
+            return
+        if not self.connection or not self.connection.is_connected():
+            await self.connect()
+        
+        # 계정별/좌석별 마지막 잔액만 반영
+        balances = {}
+        seat_chips = {}
+        for entry in entries:
+            balances[entry.account] = entry.balance_after
+            if entry.player_id:
+                seat_chips[entry.player_id] = entry.balance_after
+        
+        cursor = self.connection.cursor()
+        try:
+            self.connection.start_transaction()
+            cursor.executemany(
+                "INSERT INTO chip_ledger (account, player_id, room_id, delta, reason, balance_after) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+                [(e.account, e.player_id, e.room_id, e.delta, e.reason, e.balance_after) for e in entries]
+            )
+            cursor.executemany(
+                "INSERT INTO chip_balances (account, balance) VALUES (%s, %s) "
+                "ON DUPLICATE KEY UPDATE balance = VALUES(balance)",
+                list(balances.items())
+            )
+            if seat_chips:
+                cursor.executemany(
+                    "UPDATE players SET chips = %s WHERE id = %s",
+                    [(chips, player_id) for player_id, chips in seat_chips.items()]
+                )
+            self.connection.commit()
+        except Error:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    @track_db_query
+    async def get_ledger_balances(self, accounts: list) -> Dict[str, int]:
+        """계정별 원장 합계 (잔액 대조용)"""
+        if not accounts:
+            return {}
+        if not self.connection or not self.connection.is_connected():
+            await self.connect()
+        
+        cursor = self.connection.cursor()
+        placeholders = ", ".join(["%s"] * len(accounts))
+        query = f"SELECT account, SUM(delta) FROM chip_ledger WHERE account IN ({placeholders}) GROUP BY account"
+        cursor.execute(query, tuple(accounts))
+        totals = {account: int(total) for account, total in cursor.fetchall()}
+        cursor.close()
+        return totals
+    
+    @track_db_query
+    async def get_all_player_stats(self) -> List[Dict]:
+        """저장된 플레이어 통계 전체 조회 (시작 시 한 번)"""
+        if not self.connection or not self.connection.is_connected():
+            await self.connect()
+        
+        cursor = self.connection.cursor(dictionary=True)
+        query = "SELECT account, hands_played, hands_won, biggest_pot, net_chips, hand_types FROM player_stats"
+        cursor.execute(query)
+        rows = cursor.fetchall()
+        cursor.close()
+        for row in rows:
+            row['hand_types'] = json.loads(row['hand_types']) if row['hand_types'] else {}
+        return rows
+    
+    @track_db_query
+    async def save_player_stats(self, stats: List[Dict]):
+        """플레이어 통계 일괄 저장"""
+        if not stats:
+            return
+        if not self.connection or not self.connection.is_connected():
+            await self.connect()
+        
+        cursor = self.connection.cursor()
+        query = """
+            INSERT INTO player_stats (account, hands_played, hands_won, biggest_pot, net_chips, hand_types)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON DUPLICATE KEY UPDATE
+                hands_played = VALUES(hands_played),
+                hands_won = VALUES(hands_won),
+                biggest_pot = VALUES(biggest_pot),
+                net_chips = VALUES(net_chips),
+                hand_types = VALUES(hand_types)
+        """
+        cursor.executemany(query, [
+            (s['account'], s['hands_played'], s['hands_won'], s['biggest_pot'], s['net_chips'],
+             json.dumps(s['hand_types'], ensure_ascii=False))
+            for s in stats
+        ])
+        cursor.close()
+    
     async def close(self):
         """데이터베이스 연결 종료"""
         if self.connection and self.connection.is_connected():
@@ -0,0 +1,114 @@
+import os
+import random
+import secrets
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from .game_logic import SeotdaGame
+from .models import Card
+
+# DEALER_MODE=seeded : 핸드마다 시드를 기록해 재현 가능 (시드는 secrets 로 생성)
+# DEALER_MODE=secure : SystemRandom 으로 섞음 (시드 없음, 재현 불가)
+MODE = os.getenv('DEALER_MODE', 'seeded')
+# 설정 시 시드를 이 값부터 순차적으로 사용 (테스트/재현용)
+BASE_SEED = os.getenv('DEALER_SEED')
+POOL_SIZE = int(os.getenv('DEALER_POOL_SIZE', '256'))
+# 시드는 JSON 숫자로 전송되므로 JS 에서 정확히 표현되는 53비트 이내로 생성
+SEED_BITS = 53
+
+# 20장 덱은 한 번만 만들고 모든 핸드에서 공유 (Card 는 읽기 전용으로 사용)
+DECK: Tuple[Card, ...] = tuple(SeotdaGame().create_deck())
+DECK_INDICES = tuple(range(len(DECK)))
+
+
+@dataclass
+class DealtHand:
+    """한 판의 배분 결과"""
+    seed: Optional[int]
+    hands: List[List[Card]]
+
+
+def shuffled_order(seed: int) -> List[int]:
+    """시드로부터 덱 순서 생성 (같은 시드면 항상 같은 순서)"""
+    order = list(DECK_INDICES)
+    random.Random(seed).shuffle(order)
+    return order
+
+
+def hands_from_order(order: List[int], player_count: int) -> List[List[Card]]:
+    """덱 순서에서 플레이어별 2장씩 배분"""
+    return [[DECK[order[2 * i]], DECK[order[2 * i + 1]]] for i in range(player_count)]
+
+
+def replay(seed: int, player_count: int) -> List[List[Card]]:
+    """기록된 시드로 해당 핸드의 배분 재현"""
+    return hands_from_order(shuffled_order(seed), player_count)
+
+
+class Dealer:
+    """덱 재사용 및 미리 섞어둔 순서 풀을 사용하는 딜러
+
+    백그라운드 스레드가 (시드, 덱 순서) 를 풀에 채워두고, 배분 시에는 풀에서
+    꺼내 인덱스로 카드를 고르기만 한다.
+    """
+
+    def __init__(self, mode: str = MODE, base_seed: Optional[str] = BASE_SEED, pool_size: int = POOL_SIZE):
+        self.mode = mode
+        self.pool_size = pool_size
+        self.pool: deque = deque()
+        self.system_random = random.SystemRandom()
+        self.next_seed = int(base_seed) if base_seed is not None else None
+        self.seed_lock = threading.Lock()
+        self.refill_needed = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def _new_seed(self) -> int:
+        """다음 핸드 시드"""
+        if self.next_seed is None:
+            return secrets.randbits(SEED_BITS)
+        with self.seed_lock:
+            seed = self.next_seed
+            self.next_seed += 1
+            return seed
+
+    def _generate(self) -> Tuple[Optional[int], List[int]]:
+        """(시드, 덱 순서) 하나 생성"""
+        if self.mode == 'secure':
+            order = list(DECK_INDICES)
+            self.system_random.shuffle(order)
+            return None, order
+        seed = self._new_seed()
+        return seed, shuffled_order(seed)
+
+    def start(self):
+        """백그라운드 풀 채우기 시작"""
+        if self.thread is not None or self.pool_size <= 0:
+            return
+        self.thread = threading.Thread(target=self._fill_loop, name="dealer-pool", daemon=True)
+        self.thread.start()
+        self.refill_needed.set()
+
+    def _fill_loop(self):
+        """풀이 절반 이하로 줄면 다시 채움"""
+        while True:
+            self.refill_needed.wait()
+            self.refill_needed.clear()
+            while len(self.pool) < self.pool_size:
+                self.pool.append(self._generate())
+
+    def deal(self, player_count: int) -> DealtHand:
+        """플레이어 수만큼 2장씩 배분"""
+        if player_count * 2 > len(DECK):
+            raise ValueError("플레이어 수가 너무 많습니다.")
+        try:
+            seed, order = self.pool.popleft()
+        except IndexError:
+            seed, order = self._generate()
+        if self.thread is not None and len(self.pool) <= self.pool_size // 2:
+            self.refill_needed.set()
+        return DealtHand(seed=seed, hands=hands_from_order(order, player_count))
+
+
+dealer = Dealer()
@@ -2,6 +2,9 @@ import random
 from typing import List, Optional
 from .models import Player, Card
 
+# 화투 무늬 (덱 생성 순서이자 프로토콜 인코딩 순서)
+SUITS = ("pine", "plum", "cherry", "wisteria", "iris", "peony", "bush", "pampas", "chrysanthemum", "maple")
+
 class SeotdaGame:
     """섯다게임 로직 클래스"""
     
@@ -11,10 +14,9 @@ class SeotdaGame:
     
     def create_deck(self) -> List[Card]:
         """화투 덱 생성 (섯다용 20장)"""
-        suits = ["pine", "plum", "cherry", "wisteria", "iris", "peony", "bush", "pampas", "chrysanthemum", "maple"]
         deck = []
         
-        for suit in suits:
+        for suit in SUITS:
             deck.append(Card(suit=suit, number=1))
             deck.append(Card(suit=suit, number=2))
         
@@ -70,6 +72,10 @@ class SeotdaGame:
         total = (card1.number + card2.number) % 10
         return (total, total)
 
+    def determine_winner(self, players: List[Player]) -> Player:
+        """가장 높은 패를 가진 플레이어 (같으면 먼저 앉은 플레이어)"""
+        return max(players, key=lambda p: self.get_hand_value(p.cards))
+
     def get_hand_name(self, cards: List[Card]) -> str:
         """섯다 패 이름 반환"""
         if len(cards) != 2:
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+STARTING_CHIPS = int(os.getenv('STARTING_CHIPS', '1000'))
+# 원장 기록을 DB 에 모아서 쓰는 주기 (초) 와 한 번에 쓰는 최대 개수
+FLUSH_INTERVAL = float(os.getenv('LEDGER_FLUSH_INTERVAL', '1'))
+FLUSH_BATCH_SIZE = int(os.getenv('LEDGER_FLUSH_BATCH_SIZE', '500'))
+# 캐시 잔액과 원장 합계를 대조하는 주기 (초)
+RECONCILE_INTERVAL = float(os.getenv('LEDGER_RECONCILE_INTERVAL', '300'))
+
+
+@dataclass
+class LedgerEntry:
+    """칩 변동 한 건 (추가만 가능)"""
+    account: str
+    player_id: Optional[str]
+    room_id: Optional[str]
+    delta: int
+    reason: str  # initial, call, raise, all_in, half, payout, reconcile
+    balance_after: int
+    created_at: float
+
+
+class ChipLedger:
+    """플레이어 칩 원장 및 write-back 잔액 캐시
+
+    계정은 플레이어 이름으로 구분한다. 잔액 조회/변경은 메모리 캐시에서만 처리하고,
+    변동 내역은 모아 두었다가 주기적으로 한 번에 DB 에 기록한다. 원장 합계와 캐시를
+    주기적으로 대조해 불일치를 바로잡는다.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self.balances: Dict[str, int] = {}
+        self.pending: List[LedgerEntry] = []
+        # 계정별 현재 접속 중인 자리 수 (0 이 되면 flush 후 캐시에서 제거)
+        self.refcounts: Dict[str, int] = {}
+        self.flush_lock = asyncio.Lock()
+        self.last_reconcile = time.monotonic()
+        # 대조로 잔액을 바로잡았을 때 (계정, 잔액) 을 받는 콜백 (앉아 있는 자리의 칩 갱신 등)
+        self.correction_listeners: List[Callable[[str, int], None]] = []
+
+    async def load(self, account: str) -> int:
+        """계정 잔액을 캐시에 올리고 반환 (접속 시 한 번만 DB 조회)"""
+        self.refcounts[account] = self.refcounts.get(account, 0) + 1
+        if account in self.balances:
+            return self.balances[account]
+        balance = await self.db.get_chip_balance(account)
+        if account in self.balances:
+            # 조회하는 동안 다른 연결이 먼저 올려둔 경우
+            return self.balances[account]
+        if balance is None:
+            self.balances[account] = 0
+            return self.record(account, None, None, STARTING_CHIPS, "initial")
+        self.balances[account] = balance
+        return balance
+
+    def release(self, account: str):
+        """퇴장 시 호출 - 더 이상 접속 중인 자리가 없으면 다음 flush 후 캐시에서 제거"""
+        count = self.refcounts.get(account, 0) - 1
+        if count > 0:
+            self.refcounts[account] = count
+        else:
+            self.refcounts.pop(account, None)
+
+    def balance(self, account: str) -> int:
+        """캐시 잔액 (DB 조회 없음)"""
+        return self.balances.get(account, 0)
+
+    def record(self, account: str, player_id: Optional[str], room_id: Optional[str],
+               delta: int, reason: str) -> int:
+        """칩 변동 기록 후 변경된 잔액 반환"""
+        balance = self.balances.get(account, 0) + delta
+        self.balances[account] = balance
+        self.pending.append(LedgerEntry(
+            account=account,
+            player_id=player_id,
+            room_id=room_id,
+            delta=delta,
+            reason=reason,
+            balance_after=balance,
+            created_at=time.time(),
+        ))
+        return balance
+
+    async def flush(self):
+        """대기 중인 원장 기록을 일괄 저장"""
+        async with self.flush_lock:
+            while self.pending:
+                batch = self.pending[:FLUSH_BATCH_SIZE]
+                del self.pending[:len(batch)]
+                try:
+                    await self.db.append_ledger_entries(batch)
+                except Exception as e:
+                    # 실패한 기록은 순서를 유지한 채 다시 대기열 앞으로
+                    self.pending[:0] = batch
+                    print(f"Chip ledger flush error: {e}")
+                    return
+            self._evict()
+
+    def _evict(self):
+        """접속 중인 자리가 없고 저장되지 않은 기록도 없는 계정을 캐시에서 제거"""
+        for account in [a for a in self.balances if a not in self.refcounts]:
+            del self.balances[account]
+
+    async def reconcile(self) -> Dict[str, Dict[str, int]]:
+        """원장 합계와 캐시 잔액 대조, 불일치 시 원장 기준으로 수정
+
+        원장 합계는 그대로이므로 delta 0 인 reconcile 기록으로 바로잡은 잔액을 남기고
+        (chip_balances 도 이 기록으로 갱신됨) correction_listeners 에 알린다.
+        """
+        await self.flush()
+        accounts = list(self.balances)
+        if not accounts or self.pending:
+            return {}
+        totals = await self.db.get_ledger_balances(accounts)
+        mismatches = {}
+        for account in accounts:
+            if account not in self.balances or any(e.account == account for e in self.pending):
+                # 대조하는 동안 새 기록이 생긴 계정은 다음 주기에 확인
+                continue
+            expected = totals.get(account, 0)
+            if self.balances[account] != expected:
+                mismatches[account] = {"cached": self.balances[account], "ledger": expected}
+                self.balances[account] = expected
+                self.pending.append(LedgerEntry(
+                    account=account,
+                    player_id=None,
+                    room_id=None,
+                    delta=0,
+                    reason="reconcile",
+                    balance_after=expected,
+                    created_at=time.time(),
+                ))
+        if mismatches:
+            print(f"Chip ledger reconciliation fixed {len(mismatches)} accounts: {mismatches}")
+            for account in mismatches:
+                for listener in self.correction_listeners:
+                    listener(account, self.balances[account])
+        self.last_reconcile = time.monotonic()
+        return mismatches
+
+    async def run(self):
+        """주기적 flush 및 대조 작업"""
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            try:
+                if time.monotonic() - self.last_reconcile >= RECONCILE_INTERVAL:
+                    await self.reconcile()
+                else:
+                    await self.flush()
+            except Exception as e:
+                print(f"Chip ledger job error: {e}")
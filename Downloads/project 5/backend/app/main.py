@@ -1,6 +1,7 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import PlainTextResponse, JSONResponse
 from pydantic import BaseModel
 import json
 import asyncio
@@ -9,9 +10,29 @@ from typing import Dict, List, Optional
 import mysql.connector
 from mysql.connector import Error
 import os
-from .database import Database
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import quote
+from .database import create_database
 from .game_logic import SeotdaGame, Card
-from .models import GameRoom, Player, BetAction
+from .models import GameRoom, Player, BetAction, MAX_PLAYERS
+from . import metrics
+from . import watchdog
+from .dealer import dealer
+from . import protocol
+from .protocol import Frame
+from .sessions import sessions, GRACE_SECONDS
+from .matchmaking import seat_index
+from .spectators import spectators, Spectator
+from .ledger import ChipLedger
+from .stats import StatsTracker, LEADERBOARD_METRICS
+from . import admission
+from .admission import shedder, ConnectionLimiter
+from .archive import HistoryArchiver
+from . import tournament
+from .tournament import tournaments, Tournament, seat_players, rebalance
+from . import bots
+from .bots import BotDriver
 
 app = FastAPI(title="Seotda Game API")
 
@@ -24,14 +45,63 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 데이터베이스 연결
-db = Database()
+# 데이터베이스 연결 (DB_BACKEND 로 MySQL / SQLite 선택)
+db = create_database()
+
+# 칩 원장 (잔액은 메모리 캐시, 변동 내역은 일괄 저장)
+ledger = ChipLedger(db)
+
+def sync_ledger_balance(account: str, balance: int):
+    """원장 대조로 바로잡은 잔액을 같은 계정의 모든 자리에 반영"""
+    for room in game_rooms.values():
+        seated = [p for p in room.players if p.name == account and p.uses_ledger]
+        for player in seated:
+            player.chips = balance
+        if seated:
+            asyncio.create_task(broadcast_game_state(room.room_id))
+
+ledger.correction_listeners.append(sync_ledger_balance)
+
+# 플레이어 통계 및 순위표
+stats = StatsTracker(db)
+
+# 오래된 게임 기록 보관 (기간별 테이블 -> 압축 파일)
+archiver = HistoryArchiver(db)
+
+# 고아 행 정리 주기와 기준 (초): 메모리에 없는 플레이어 행, 비어 있고 변경 없는 방
+SWEEP_INTERVAL = float(os.getenv('SWEEP_INTERVAL', '300'))
+SWEEP_PLAYER_GRACE = int(os.getenv('SWEEP_PLAYER_GRACE', '300'))
+SWEEP_ROOM_IDLE = int(os.getenv('SWEEP_ROOM_IDLE', '3600'))
+
+# 관리자 엔드포인트 토큰 (설정된 경우 X-Admin-Token 헤더 필요)
+ADMIN_TOKEN = os.getenv('ADMIN_TOKEN')
+
+# 패 판정용 (덱은 사용하지 않으므로 하나만 만들어 재사용)
+hand_evaluator = SeotdaGame()
 
 # 게임 관리
 game_rooms: Dict[str, GameRoom] = {}
 connections: Dict[str, WebSocket] = {}
 room_list_connections: List[WebSocket] = []
 
+# lobby_batch 안에서는 방 목록 브로드캐스트를 모아 블록이 끝날 때 한 번만 전송
+lobby_batch_depth = 0
+lobby_update_pending = False
+
+# 시작 상태 (/health/ready 로 조회, 스키마 준비에 실패했으면 503)
+startup_state = {"schema_migrated": None, "schema_error": None, "rooms_warmed": 0, "startup_seconds": None}
+
+def _live_room_counts() -> Dict[tuple, int]:
+    """상태별 게임룸 수 (메트릭 스크레이프 시 계산)"""
+    counts: Dict[tuple, int] = {}
+    for room in game_rooms.values():
+        counts[(room.status,)] = counts.get((room.status,), 0) + 1
+    return counts
+
+metrics.rooms_live.set_function(_live_room_counts)
+metrics.players_live.set_function(lambda: {(): sum(len(r.players) for r in game_rooms.values())})
+metrics.spectators_live.set_function(lambda: {(): spectators.count()})
+
 # Pydantic 모델들
 class CreateRoomRequest(BaseModel):
     name: str
@@ -51,20 +121,222 @@ class UpdateRoomRequest(BaseModel):
 class JoinRoomRequest(BaseModel):
     password: Optional[str] = None
 
+class QuickJoinRequest(BaseModel):
+    player_name: str
+    max_players: Optional[int] = 4
+
+class AddBotsRequest(BaseModel):
+    count: Optional[int] = None  # 없으면 빈 자리를 모두 채움
+
+class CreateTournamentRequest(BaseModel):
+    name: str
+    players: List[str]
+    table_size: Optional[int] = 4
+    starting_stack: Optional[int] = None  # 없으면 TOURNAMENT_STARTING_STACK
+    created_by: Optional[str] = None
+
 @app.on_event("startup")
 async def startup_event():
     """애플리케이션 시작 시 데이터베이스 초기화"""
-    await db.init_database()
+    started = time.perf_counter()
+    startup_state["schema_migrated"] = await db.init_database()
+    startup_state["schema_error"] = db.schema_error
+    
+    # DB 의 게임룸을 한 번에 메모리로 올림
+    try:
+        startup_state["rooms_warmed"] = await warm_up_rooms()
+    except Exception as e:
+        print(f"Room warm-up error: {e}")
+    
+    # 이벤트 루프 지연 측정 (과부하 판단에도 쓰므로 메트릭 비활성화와 관계없이 실행)
+    asyncio.create_task(metrics.monitor_event_loop_lag())
+    
+    # 이벤트 루프 블로킹 감시 (옵트인)
+    if watchdog.ENABLED:
+        watchdog.watchdog.start()
+    
+    # 미리 섞어둔 덱 순서 풀 채우기
+    dealer.start()
+    
+    # 칩 원장 주기적 저장 및 대조
+    asyncio.create_task(ledger.run())
+    
+    # 플레이어 통계 불러오기 및 주기적 체크포인트
+    try:
+        await stats.load()
+    except Exception as e:
+        print(f"Stats load error: {e}")
+    asyncio.create_task(stats.run())
+    
+    # 게임 기록 보관 및 고아 행 정리
+    asyncio.create_task(archiver.run())
+    asyncio.create_task(run_sweeper())
+    
+    # 봇 베팅 결정 일괄 처리
+    bot_driver.start()
+    
+    startup_state["startup_seconds"] = round(time.perf_counter() - started, 3)
+    print(f"Startup completed in {startup_state['startup_seconds']}s ({startup_state['rooms_warmed']} rooms warmed)")
+
+async def sweep_orphans() -> Dict[str, int]:
+    """크래시 등으로 남은 플레이어 행과 오래 비어 있는 방 정리"""
+    # 메모리에 없는 플레이어 행 (재접속 대기 중인 플레이어는 메모리에 있음)
+    live_players = {p.id for room in game_rooms.values() for p in room.players}
+    stale = [row for row in await db.get_stale_players(SWEEP_PLAYER_GRACE) if row['id'] not in live_players]
+    await db.delete_players([row['id'] for row in stale])
+    for room_id in {row['room_id'] for row in stale}:
+        room = game_rooms.get(room_id)
+        seat_index.resync(room_id, len(room.players) if room else 0)
+    
+    # 플레이어, 관전자, 예약이 모두 없는 방
+    idle_rooms = []
+    for room_id in await db.get_idle_empty_rooms(SWEEP_ROOM_IDLE):
+        room = game_rooms.get(room_id)
+        seats = seat_index.rooms.get(room_id)
+        if (room and room.players) or spectators.count(room_id) or (seats and seats.reservations):
+            continue
+        idle_rooms.append(room_id)
+    await db.delete_rooms(idle_rooms)
+    for room_id in idle_rooms:
+        game_rooms.pop(room_id, None)
+        seat_index.remove_room(room_id)
+    if idle_rooms:
+        await broadcast_room_list_update()
+    
+    result = {"players": len(stale), "rooms": len(idle_rooms)}
+    if stale or idle_rooms:
+        print(f"Swept orphaned rows: {result}")
+    return result
+
+async def run_sweeper():
+    """주기적 고아 행 정리 작업"""
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL)
+        try:
+            await sweep_orphans()
+        except Exception as e:
+            print(f"Sweeper error: {e}")
+
+async def warm_up_rooms() -> int:
+    """DB 에 남아 있는 게임룸을 game_rooms 와 좌석 인덱스에 등록 (첫 접속 시 DB 조회 생략)"""
+    # 재시작으로 진행 중이던 판은 이어갈 수 없으므로 대기 상태로 되돌림
+    await db.reset_interrupted_games()
+    # 이전 프로세스의 자리는 메모리에 없으므로 플레이어 행도 정리 (워밍업한 방을 빈 방으로 등록)
+    await db.clear_players()
+    rooms = await db.get_live_rooms()
+    for room_data in rooms:
+        room_data['status'] = 'waiting'
+        if room_data['id'] not in game_rooms:
+            game_rooms[room_data['id']] = GameRoom(room_id=room_data['id'])
+        seat_index.register(room_data)
+    return len(rooms)
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """애플리케이션 종료 시 정리"""
+    watchdog.watchdog.stop()
+    bot_driver.stop()
+    await ledger.flush()
+    try:
+        await stats.checkpoint()
+    except Exception as e:
+        print(f"Stats checkpoint error: {e}")
     await db.close()
 
 @app.get("/")
 async def root():
     return {"message": "섯다게임 API 서버"}
 
+@app.get("/health/live")
+async def health_live():
+    """프로세스 생존 확인"""
+    return {"status": "ok"}
+
+@app.get("/health/ready")
+async def health_ready():
+    """요청 처리 가능 여부 (uvicorn 은 시작 이벤트가 끝난 뒤에만 요청을 받으므로 스키마 상태만 확인)"""
+    if startup_state["schema_error"]:
+        return JSONResponse(status_code=503, content={"status": "schema_error", **startup_state})
+    return {"status": "ready", **startup_state}
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus 형식 메트릭 조회"""
+    if not metrics.ENABLED:
+        raise HTTPException(status_code=404, detail="메트릭이 비활성화되어 있습니다.")
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+def require_admin(x_admin_token: Optional[str]):
+    """관리자 토큰 확인"""
+    if ADMIN_TOKEN and x_admin_token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="관리자 권한이 필요합니다.")
+
+@app.get("/admin/stalls")
+async def get_stalls(x_admin_token: Optional[str] = Header(None)):
+    """이벤트 루프 블로킹 기록 및 가장 느린 메시지 처리 목록 조회"""
+    require_admin(x_admin_token)
+    if not watchdog.ENABLED:
+        raise HTTPException(status_code=404, detail="블로킹 감시가 비활성화되어 있습니다.")
+    return watchdog.watchdog.snapshot()
+
+async def send_frame(websocket: WebSocket, frame: Frame, protocol_name: str = protocol.JSON):
+    """인코딩된 프레임 전송 (전송 시간/실패 메트릭 기록)"""
+    data = frame.encoded(protocol_name)
+    if not metrics.ENABLED:
+        if protocol_name == protocol.COMPACT:
+            await websocket.send_bytes(data)
+        else:
+            await websocket.send_text(data)
+        return
+    
+    start = time.perf_counter()
+    try:
+        if protocol_name == protocol.COMPACT:
+            await websocket.send_bytes(data)
+        else:
+            await websocket.send_text(data)
+    except Exception:
+        metrics.ws_send_failures.inc(frame.type)
+        raise
+    finally:
+        metrics.ws_send_seconds.observe(time.perf_counter() - start, frame.type)
+
+async def send_message(websocket: WebSocket, message: dict, protocol_name: str = protocol.JSON):
+    """WebSocket 메시지 전송"""
+    await send_frame(websocket, Frame(message), protocol_name)
+
+async def send_to_player(player: Player, message: dict):
+    """플레이어가 협상한 프로토콜로 메시지 전송 (재접속 대기 중이면 생략)"""
+    if not player.connected:
+        return
+    await send_frame(player.websocket, Frame(message), player.protocol)
+
+async def broadcast_to_room(room: GameRoom, message: dict):
+    """방의 모든 플레이어에게 전송 (프로토콜별로 한 번만 인코딩)"""
+    room.events.append(message)
+    frame = Frame(message)
+    for player in room.players:
+        if not player.connected:
+            continue
+        try:
+            await send_frame(player.websocket, frame, player.protocol)
+        except:
+            pass
+
+async def receive_message(websocket: WebSocket) -> Optional[dict]:
+    """JSON 텍스트 또는 compact 바이너리 프레임 수신 (해석할 수 없거나 객체가 아니면 None)"""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    try:
+        if message.get("bytes") is not None:
+            data = protocol.decode_client(message["bytes"])
+        else:
+            data = json.loads(message.get("text") or "")
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
 # 방 목록 조회
 @app.get("/api/rooms")
 async def get_rooms():
@@ -79,6 +351,10 @@ async def get_rooms():
 @app.post("/api/rooms")
 async def create_room(room_request: CreateRoomRequest):
     """새 게임룸 생성"""
+    # 과부하 시 진행 중인 게임보다 먼저 거부
+    if not shedder.admit("create_room", admission.SHED_LOBBY):
+        raise HTTPException(status_code=503, detail="서버가 혼잡합니다. 잠시 후 다시 시도해주세요.")
+    
     try:
         room_id = str(uuid.uuid4())[:8]
         
@@ -98,6 +374,7 @@ async def create_room(room_request: CreateRoomRequest):
         # 메모리에 게임룸 객체 생성
         game_room = GameRoom(room_id=room_id)
         game_rooms[room_id] = game_room
+        seat_index.add_room(room_id, room_data["max_players"] or 4, room_data["is_private"])
         
         # 방 목록을 구독하는 모든 클라이언트에게 업데이트 전송
         await broadcast_room_list_update()
@@ -106,6 +383,54 @@ async def create_room(room_request: CreateRoomRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# 빠른 참가
+@app.post("/api/quick-join")
+async def quick_join(join_request: QuickJoinRequest):
+    """빈 자리가 있는 공개 대기방에 자리를 예약 (없으면 새 방 생성)"""
+    if not shedder.admit("quick_join", admission.SHED_JOINS):
+        raise HTTPException(status_code=503, detail="서버가 혼잡합니다. 잠시 후 다시 시도해주세요.")
+    
+    room_id = seat_index.find()
+    reservation = seat_index.reserve(room_id) if room_id else None
+    if not reservation and not shedder.admit("create_room", admission.SHED_LOBBY):
+        raise HTTPException(status_code=503, detail="서버가 혼잡합니다. 잠시 후 다시 시도해주세요.")
+    
+    try:
+        # 자리 검색과 예약 사이에 await 가 없으므로 다른 요청과 경쟁하지 않음
+        created = False
+        
+        if not reservation:
+            room_id = str(uuid.uuid4())[:8]
+            room_data = {
+                "id": room_id,
+                "name": f"{join_request.player_name}님의 빠른 대전",
+                "description": "",
+                "max_players": join_request.max_players or 4,
+                "is_private": False,
+                "password": None,
+                "created_by": join_request.player_name
+            }
+            # DB 생성 전에 인덱스에 등록/예약해 동시에 들어온 요청이 이 방을 함께 쓰도록 함
+            seat_index.add_room(room_id, room_data["max_players"])
+            reservation = seat_index.reserve(room_id)
+            try:
+                await db.create_room(room_data)
+            except Exception:
+                seat_index.remove_room(room_id)
+                raise
+            game_rooms[room_id] = GameRoom(room_id=room_id)
+            created = True
+            await broadcast_room_list_update()
+        
+        return {
+            "room_id": room_id,
+            "reservation": reservation,
+            "created": created,
+            "ws_url": f"/ws/{room_id}/{quote(join_request.player_name)}?reservation={reservation}"
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 # 특정 방 조회
 @app.get("/api/rooms/{room_id}")
 async def get_room(room_id: str):
@@ -155,6 +480,8 @@ async def update_room(room_id: str, room_request: UpdateRoomRequest):
         
         # 데이터베이스 업데이트
         await db.update_room(room_id, update_data)
+        seat_index.update_room(room_id, max_players=update_data.get('max_players'),
+                               is_private=update_data.get('is_private'))
         
         # 방 목록 업데이트 브로드캐스트
         await broadcast_room_list_update()
@@ -187,8 +514,11 @@ async def delete_room(room_id: str):
         if room_id in game_rooms:
             game_room = game_rooms[room_id]
             for player in game_room.players:
+                sessions.discard(player.resume_token)
+                if not player.connected:
+                    continue
                 try:
-                    await player.websocket.send_json({
+                    await send_to_player(player, {
                         "type": "room_deleted",
                         "message": "방이 삭제되었습니다."
                     })
@@ -199,8 +529,14 @@ async def delete_room(room_id: str):
             # 메모리에서 게임룸 제거
             del game_rooms[room_id]
         
+        spectators.close_room(room_id, Frame({
+            "type": "room_deleted",
+            "message": "방이 삭제되었습니다."
+        }))
+        
         # 데이터베이스에서 방 삭제 (CASCADE로 플레이어도 자동 삭제)
         await db.delete_room(room_id)
+        seat_index.remove_room(room_id)
         
         # 방 목록 업데이트 브로드캐스트
         await broadcast_room_list_update()
@@ -235,17 +571,146 @@ async def join_room_check(room_id: str, join_request: JoinRoomRequest):
             raise e
         raise HTTPException(status_code=500, detail=str(e))
 
+# 봇 추가
+@app.post("/api/rooms/{room_id}/bots")
+async def add_bots(room_id: str, request: AddBotsRequest):
+    """대기 중인 방의 빈 자리에 봇 추가"""
+    # 봇은 결정 계산 부하를 만들므로 방 생성과 같은 기준으로 과부하 시 거부
+    if not shedder.admit("add_bots", admission.SHED_LOBBY):
+        raise HTTPException(status_code=503, detail="서버가 혼잡합니다. 잠시 후 다시 시도해주세요.")
+    room = game_rooms.get(room_id)
+    if not room or not room.players:
+        raise HTTPException(status_code=404, detail="방을 찾을 수 없습니다.")
+    if tournaments.for_room(room_id):
+        raise HTTPException(status_code=400, detail="토너먼트 테이블에는 봇을 추가할 수 없습니다.")
+    if room.status == "playing":
+        raise HTTPException(status_code=400, detail="게임 진행 중에는 봇을 추가할 수 없습니다.")
+    
+    added = []
+    while request.count is None or len(added) < request.count:
+        if len(room.players) >= MAX_PLAYERS or not seat_index.claim(room_id):
+            break
+        bot = Player(id=str(uuid.uuid4())[:8], name=f"봇-{uuid.uuid4().hex[:4]}", websocket=None)
+        bot.is_bot = True
+        bot.uses_ledger = False
+        bot.ready = True
+        bot.chips = bots.BOT_CHIPS
+        room.add_player(bot)
+        await db.add_player_to_room(room_id, bot.id, bot.name)
+        added.append({"id": bot.id, "name": bot.name})
+    
+    if not added:
+        raise HTTPException(status_code=400, detail="방이 가득 찼습니다.")
+    
+    await broadcast_game_state(room_id)
+    await broadcast_room_list_update()
+    return {"bots": added}
+
+# 순위표
+@app.get("/api/leaderboard")
+async def get_leaderboard(metric: str = "net_chips", limit: int = 10):
+    """순위표 상위 플레이어 조회 (메모리에서 바로 조회)"""
+    if metric not in LEADERBOARD_METRICS:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 순위 기준입니다: {metric}")
+    limit = max(1, min(limit, 100))
+    return {"metric": metric, "leaders": stats.top(metric, limit)}
+
+# 플레이어 통계
+@app.get("/api/players/{player_name}/stats")
+async def get_player_stats(player_name: str):
+    """플레이어 누적 통계 조회"""
+    player_stats = stats.get(player_name)
+    if not player_stats:
+        raise HTTPException(status_code=404, detail="플레이어 기록이 없습니다.")
+    return player_stats
+
+# 토너먼트 생성
+@app.post("/api/tournaments")
+async def create_tournament(request: CreateTournamentRequest):
+    """토너먼트 테이블을 한 번에 만들고 참가자 자리 배정"""
+    if not shedder.admit("create_room", admission.SHED_LOBBY):
+        raise HTTPException(status_code=503, detail="서버가 혼잡합니다. 잠시 후 다시 시도해주세요.")
+    table_size = request.table_size or tournament.MAX_TABLE_SIZE
+    if not 2 <= table_size <= tournament.MAX_TABLE_SIZE:
+        raise HTTPException(status_code=400, detail=f"테이블 인원은 2~{tournament.MAX_TABLE_SIZE}명이어야 합니다.")
+    if len(request.players) < 2 or len(set(request.players)) != len(request.players):
+        raise HTTPException(status_code=400, detail="서로 다른 참가자가 2명 이상 필요합니다.")
+    starting_stack = request.starting_stack or tournament.STARTING_STACK
+    if starting_stack < tournament.MIN_CHIPS:
+        raise HTTPException(status_code=400, detail=f"시작 칩은 {tournament.MIN_CHIPS} 이상이어야 합니다.")
+    
+    tour = Tournament(request.name, request.players, table_size, request.created_by, starting_stack)
+    seating = seat_players(request.players, table_size)
+    rooms = [
+        {
+            "id": str(uuid.uuid4())[:8],
+            "name": f"{request.name} 테이블 {i + 1}",
+            "description": "",
+            "max_players": table_size,
+            "is_private": True,
+            "password": None,
+            "created_by": request.created_by
+        } for i in range(len(seating))
+    ]
+    
+    try:
+        # 테이블 전체를 한 번의 배치로 생성
+        await db.create_rooms(rooms)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    seats = {}
+    for room_data, names in zip(rooms, seating):
+        room_id = room_data["id"]
+        game_rooms[room_id] = GameRoom(room_id=room_id)
+        seat_index.add_room(room_id, table_size, is_private=True)
+        tour.tables[room_id] = list(names)
+        for name in names:
+            seats[name] = tournament_seat(room_id, name)
+    tournaments.add(tour)
+    
+    # 방 목록은 테이블 수와 관계없이 한 번만 갱신
+    await broadcast_room_list_update()
+    
+    return {**tour.to_dict(), "seats": seats}
+
+# 토너먼트 시작
+@app.post("/api/tournaments/{tournament_id}/start")
+async def start_tournament(tournament_id: str):
+    """모든 테이블에서 동시에 판 시작 (2명 이상 접속한 테이블)"""
+    tour = tournaments.get(tournament_id)
+    if not tour:
+        raise HTTPException(status_code=404, detail="토너먼트를 찾을 수 없습니다.")
+    if tour.status == "finished":
+        raise HTTPException(status_code=400, detail="이미 끝난 토너먼트입니다.")
+    tour.status = "running"
+    started = await start_tournament_tables(tour)
+    return {**tour.to_dict(), "started_tables": started}
+
+# 토너먼트 조회
+@app.get("/api/tournaments/{tournament_id}")
+async def get_tournament(tournament_id: str):
+    """토너먼트 테이블 배치와 순위 조회"""
+    tour = tournaments.get(tournament_id)
+    if not tour:
+        raise HTTPException(status_code=404, detail="토너먼트를 찾을 수 없습니다.")
+    return tour.to_dict()
+
 # 방 목록 실시간 구독
 @app.websocket("/ws/rooms")
 async def websocket_room_list(websocket: WebSocket):
     """방 목록 실시간 업데이트 WebSocket"""
+    # 과부하 시 새 구독자는 받지 않음 (수락 전에 닫으면 연결 거부)
+    if not shedder.admit("room_list", admission.SHED_LOBBY):
+        await websocket.close(code=1013)
+        return
     await websocket.accept()
     room_list_connections.append(websocket)
     
     try:
         # 초기 방 목록 전송
         rooms = await db.get_all_rooms()
-        await websocket.send_json({
+        await send_message(websocket, {
             "type": "room_list",
             "rooms": rooms
         })
@@ -256,70 +721,382 @@ async def websocket_room_list(websocket: WebSocket):
     except WebSocketDisconnect:
         room_list_connections.remove(websocket)
 
+# 관전 WebSocket
+@app.websocket("/ws/{room_id}")
+async def websocket_spectator(websocket: WebSocket, room_id: str):
+    """읽기 전용 관전 (공개 게임 상태만 수신, 플레이어 패는 받지 않음)"""
+    await websocket.accept(subprotocol=protocol.negotiate(websocket))
+    protocol_name = protocol.requested_protocol(websocket)
+    
+    room = game_rooms.get(room_id)
+    if not room:
+        await send_message(websocket, {"type": "error", "message": "방을 찾을 수 없습니다."}, protocol_name)
+        await websocket.close()
+        return
+    
+    if not shedder.admit("spectate", admission.SHED_JOINS):
+        await send_message(websocket, {"type": "error", "message": "서버가 혼잡합니다. 잠시 후 다시 시도해주세요."}, protocol_name)
+        await websocket.close(code=1013)
+        return
+    
+    spectator = Spectator(websocket, protocol_name)
+    if not spectators.add(room_id, spectator):
+        await send_message(websocket, {"type": "error", "message": "관전자가 너무 많습니다."}, protocol_name)
+        await websocket.close()
+        return
+    
+    # 현재 상태부터 전송
+    game_state = room.last_state or build_game_state(room)
+    if protocol_name == protocol.COMPACT:
+        spectator.push(Frame({"type": "roster", "players": game_state["players"]}))
+        spectator.roster_sent = tuple(p["id"] for p in game_state["players"])
+    spectator.push(Frame(game_state))
+    sender = asyncio.create_task(spectators.serve(spectator, send_frame))
+    
+    try:
+        # 관전자가 보내는 메시지는 무시하고 연결 종료만 감지
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        spectators.remove(room_id, spectator)
+        sender.cancel()
+
 # 게임룸 WebSocket
 @app.websocket("/ws/{room_id}/{player_name}")
 async def websocket_endpoint(websocket: WebSocket, room_id: str, player_name: str):
     """게임룸 WebSocket 연결 처리"""
-    await websocket.accept()
+    # 클라이언트가 요청한 경우 compact 바이너리 프로토콜 사용
+    await websocket.accept(subprotocol=protocol.negotiate(websocket))
+    protocol_name = protocol.requested_protocol(websocket)
     
-    player_id = str(uuid.uuid4())[:8]
-    connections[player_id] = websocket
+    # 재접속 토큰이 유효하면 DB/로비 갱신 없이 기존 자리로 복귀
+    player = await resume_session(websocket, room_id, protocol_name)
+    player_id = player.id if player else str(uuid.uuid4())[:8]
     
     try:
-        # 방 존재 확인
-        room_data = await db.get_room_by_id(room_id)
-        if not room_data:
-            await websocket.send_json({"type": "error", "message": "방을 찾을 수 없습니다."})
-            return
-        
-        # 방이 가득 찬지 확인
-        if room_data['current_players'] >= room_data['max_players']:
-            await websocket.send_json({"type": "error", "message": "방이 가득 찼습니다."})
-            return
-        
-        # 플레이어를 게임룸에 추가
-        if room_id not in game_rooms:
-            game_rooms[room_id] = GameRoom(room_id=room_id)
-        
-        room = game_rooms[room_id]
-        player = Player(id=player_id, name=player_name, websocket=websocket)
-        
-        room.add_player(player)
-        await db.add_player_to_room(room_id, player_id, player_name)
-        
-        # 방 목록 업데이트 (플레이어 수 변경)
-        await broadcast_room_list_update()
+        if not player:
+            # 과부하 시 새 입장 거부 (재접속은 진행 중인 판이므로 허용)
+            if not shedder.admit("join", admission.SHED_JOINS):
+                await send_message(websocket, {"type": "error", "message": "서버가 혼잡합니다. 잠시 후 다시 시도해주세요."}, protocol_name)
+                await websocket.close(code=1013)
+                return
+            
+            # 방 존재 확인 (시작 시 워밍업했거나 이미 메모리에 있는 방은 DB 조회 생략)
+            if room_id not in game_rooms or room_id not in seat_index.rooms:
+                room_data = await db.get_room_by_id(room_id)
+                if not room_data:
+                    await send_message(websocket, {"type": "error", "message": "방을 찾을 수 없습니다."}, protocol_name)
+                    return
+                seat_index.register(room_data)
+            
+            # 토너먼트 테이블은 배정된 참가자만 앉을 수 있음
+            tour = tournaments.for_room(room_id)
+            if tour and player_name not in tour.tables.get(room_id, ()):
+                await send_message(websocket, {"type": "error", "message": "이 테이블에 배정된 참가자가 아닙니다."}, protocol_name)
+                return
+            
+            # 자리 차지 (빠른 참가 예약이 있으면 예약한 자리 사용)
+            if not seat_index.claim(room_id, websocket.query_params.get("reservation")):
+                await send_message(websocket, {"type": "error", "message": "방이 가득 찼습니다."}, protocol_name)
+                return
+            
+            # 플레이어를 게임룸에 추가
+            if room_id not in game_rooms:
+                game_rooms[room_id] = GameRoom(room_id=room_id)
+            
+            room = game_rooms[room_id]
+            player = Player(id=player_id, name=player_name, websocket=websocket)
+            player.protocol = protocol_name
+            player.deltas = wants_deltas(websocket, protocol_name)
+            
+            try:
+                if tour:
+                    # 토너먼트 테이블은 계정 잔액 대신 토너먼트 칩 사용
+                    player.uses_ledger = False
+                    player.chips = tour.stacks[player_name]
+                else:
+                    # 저장된 칩 잔액으로 시작 (처음 온 플레이어는 기본 칩 지급)
+                    player.chips = await ledger.load(player_name)
+                room.add_player(player)
+                await db.add_player_to_room(room_id, player_id, player_name)
+            except Exception:
+                room.remove_player(player_id)
+                seat_index.release(room_id)
+                if player.uses_ledger:
+                    ledger.release(player_name)
+                raise
+            
+            # 재접속 토큰 발급
+            session = sessions.create(room_id, player_id)
+            player.resume_token = session.token
+            await send_to_player(player, {
+                "type": "session",
+                "player_id": player_id,
+                "resume_token": session.token,
+                "resumed": False
+            })
+            
+            # 방 목록 업데이트 (플레이어 수 변경)
+            await broadcast_room_list_update()
+            
+            # 모든 플레이어에게 게임 상태 전송
+            await broadcast_game_state(room_id)
         
-        # 모든 플레이어에게 게임 상태 전송
-        await broadcast_game_state(room_id)
+        # 입장이 끝난 연결만 등록
+        connections[player_id] = websocket
         
         # 메시지 처리 루프
-        while True:
-            data = await websocket.receive_json()
-            await handle_message(room_id, player_id, data)
+        await receive_loop(websocket, room_id, player_id)
             
     except WebSocketDisconnect:
-        # 플레이어 연결 해제
-        if room_id in game_rooms:
-            room = game_rooms[room_id]
-            room.remove_player(player_id)
-            await db.remove_player_from_room(room_id, player_id)
+        await handle_disconnect(room_id, player_id, websocket)
+    except Exception as e:
+        # 예상하지 못한 오류에도 자리/DB 행이 남지 않도록 퇴장 처리
+        print(f"WebSocket handler error: {e}")
+        try:
+            await websocket.close(code=1011)
+        except:
+            pass
+        await handle_disconnect(room_id, player_id, websocket)
+
+async def receive_loop(websocket: WebSocket, room_id: str, player_id: str):
+    """메시지 수신 루프
+    
+    연결별/타입별 한도를 넘은 메시지는 버리고, 허용된 메시지는 크기가 제한된 대기열에 넣어
+    처리 태스크가 순서대로 handle_message 로 처리한다. 한도 초과가 계속되면 연결을 끊는다.
+    """
+    limiter = ConnectionLimiter()
+    inbox: asyncio.Queue = asyncio.Queue(maxsize=admission.INBOUND_QUEUE_SIZE)
+    worker = asyncio.create_task(process_inbox(room_id, player_id, inbox))
+    try:
+        while True:
+            data = await receive_message(websocket)
+            if worker.done():
+                break
             
-            # 방에 플레이어가 없으면 방 삭제
-            if not room.players:
-                await db.delete_room(room_id)
-                del game_rooms[room_id]
+            # 해석할 수 없는 프레임은 한도 초과 메시지와 같이 거부 (누적되면 연결 종료)
+            message_type = data.get("type") if data is not None else None
+            if not isinstance(message_type, str):
+                scope = "invalid"
+                decision = "invalid"
+            else:
+                scope = message_type if message_type in MESSAGE_TYPES else "unknown"
+                decision = None if limiter.admit(message_type) else "rate_limited"
             
-            await broadcast_game_state(room_id)
+            if decision:
+                metrics.admission_decisions.inc(scope, decision)
+                if not limiter.strike():
+                    metrics.admission_decisions.inc(scope, "disconnected")
+                    await websocket.close(code=1008)
+                    raise WebSocketDisconnect(1008)
+                if limiter.should_notify():
+                    notice = "잘못된 메시지입니다." if decision == "invalid" else "요청이 너무 많습니다."
+                    await send_message(websocket, {"type": "error", "message": notice},
+                                       protocol.requested_protocol(websocket))
+                continue
+            
+            try:
+                inbox.put_nowait(data)
+            except asyncio.QueueFull:
+                metrics.admission_decisions.inc(scope, "queue_full")
+                continue
+            shedder.queued(1)
+            metrics.admission_decisions.inc(scope, "admitted")
+            # 수신 버퍼가 차 있어도 처리 태스크가 실행될 기회를 줌
+            await asyncio.sleep(0)
+    finally:
+        # 남은 메시지는 버리고 처리 중인 메시지만 마친 뒤 종료
+        while not inbox.empty():
+            inbox.get_nowait()
+            shedder.queued(-1)
+        if not worker.done():
+            inbox.put_nowait(None)
+            await asyncio.wait([worker])
+        if not worker.cancelled() and worker.exception():
+            print(f"Message handling error: {worker.exception()}")
+    
+    # 처리 태스크가 실패했으면 연결을 끊고 퇴장 처리
+    try:
+        await websocket.close(code=1011)
+    except:
+        pass
+    raise WebSocketDisconnect(1011)
+
+async def process_inbox(room_id: str, player_id: str, inbox: asyncio.Queue):
+    """수신 대기열의 메시지를 순서대로 처리"""
+    while True:
+        data = await inbox.get()
+        if data is None:
+            return
+        shedder.queued(-1)
+        await handle_message(room_id, player_id, data)
+
+async def resume_session(websocket: WebSocket, room_id: str, protocol_name: str) -> Optional[Player]:
+    """?resume=<토큰>&last_seq=<순번> 으로 재접속한 경우 기존 자리에 연결하고 놓친 이벤트 전송"""
+    session = sessions.get(websocket.query_params.get("resume"))
+    if not session or session.room_id != room_id:
+        return None
+    
+    room = game_rooms.get(room_id)
+    player = room.get_player(session.player_id) if room else None
+    if not player:
+        sessions.discard(session.token)
+        return None
+    
+    sessions.cancel_expiry(session)
+    
+    # 이전 연결이 아직 열려 있으면 닫고 새 연결로 교체
+    old_websocket = player.websocket
+    player.websocket = websocket
+    player.protocol = protocol_name
+    player.deltas = wants_deltas(websocket, protocol_name)
+    player.roster_sent = None
+    player.state_seq = None
+    if old_websocket is not None:
+        try:
+            await old_websocket.close()
+        except:
+            pass
+    
+    await send_to_player(player, {
+        "type": "session",
+        "player_id": player.id,
+        "resume_token": session.token,
+        "resumed": True
+    })
+    
+    # 놓친 이벤트만 재전송, 버퍼에서 밀려났거나 compact 연결이면 본인 패와 전체 상태 한 번
+    try:
+        last_seq = int(websocket.query_params.get("last_seq", "-1"))
+    except ValueError:
+        last_seq = -1
+    missed = None
+    if last_seq >= 0 and protocol_name == protocol.JSON:
+        missed = room.events.since(last_seq, player.id)
+    
+    if missed is None:
+        if room.status == "playing" and player.cards:
+            await send_to_player(player, {
+                "type": "cards_dealt",
+                "cards": [{"suit": c.suit, "number": c.number} for c in player.cards],
+                "seq": room.events.seq
+            })
+    else:
+        for message in missed:
+            await send_frame(websocket, Frame(message), protocol_name)
+        # 재전송한 이벤트에 마지막 게임 상태까지 포함되어 있으므로 이후에는 변경분만 전송 가능
+        player.state_seq = room.last_state_seq
+    
+    # 재접속 사실을 알리면서 본인에게는 (필요하면) 전체 상태 전송
+    await broadcast_game_state(room_id)
+    
+    return player
+
+def wants_deltas(websocket: WebSocket, protocol_name: str) -> bool:
+    """?deltas=1 로 접속한 JSON 연결은 game_state 대신 변경분(game_state_delta) 수신"""
+    return protocol_name == protocol.JSON and websocket.query_params.get("deltas") == "1"
+
+async def send_full_state(room: GameRoom, player: Player):
+    """마지막으로 브로드캐스트한 전체 게임 상태 재전송 (클라이언트 sync 요청)"""
+    if room.last_state is None:
+        await broadcast_game_state(room.room_id)
+        return
+    if player.protocol == protocol.COMPACT:
+        await player.websocket.send_bytes(protocol.encode_roster(room.last_state["players"]))
+        player.roster_sent = tuple(p["id"] for p in room.last_state["players"])
+    await send_to_player(player, room.last_state)
+    player.state_seq = room.last_state_seq
+
+async def handle_disconnect(room_id: str, player_id: str, websocket: WebSocket):
+    """연결 해제 처리 (재접속 유예 시간 동안 자리 유지)"""
+    if connections.get(player_id) is websocket:
+        del connections[player_id]
+    
+    room = game_rooms.get(room_id)
+    player = room.get_player(player_id) if room else None
+    if player and player.websocket is not websocket:
+        # 이미 새 연결로 재접속함
+        return
+    
+    session = sessions.get(player.resume_token) if player else None
+    if session and GRACE_SECONDS > 0:
+        player.websocket = None
+        sessions.schedule_expiry(session, lambda: remove_player(room_id, player_id))
+        await broadcast_game_state(room_id)
+        return
+    
+    await remove_player(room_id, player_id)
+
+async def remove_player(room_id: str, player_id: str):
+    """플레이어 퇴장 처리"""
+    if room_id not in game_rooms:
+        return
+    
+    room = game_rooms[room_id]
+    player = room.get_player(player_id)
+    if not player:
+        # 이미 퇴장 처리됨 (토너먼트 이동/탈락 후 연결 종료 등)
+        return
+    if player.resume_token:
+        sessions.discard(player.resume_token)
+    if player.uses_ledger:
+        ledger.release(player.name)
+    
+    # 진행 중인 판에서 자기 차례에 나가면 남은 사람 중 다음 차례로 넘김
+    playing = room.status == "playing"
+    if playing and room.current_player == player_id:
+        room.next_turn()
+    
+    room.remove_player(player_id)
+    seat_index.release(room_id)
+    await db.remove_player_from_room(room_id, player_id)
+    
+    # 사람이 모두 나가면 봇도 퇴장 (마지막 봇이 나갈 때 방 삭제)
+    if room.players and all(p.is_bot for p in room.players):
+        for bot in list(room.players):
+            await remove_player(room_id, bot.id)
+        return
+    
+    # 방에 플레이어가 없으면 방 삭제
+    if not room.players:
+        await db.delete_room(room_id)
+        del game_rooms[room_id]
+        seat_index.remove_room(room_id)
+        spectators.close_room(room_id)
+    
+    # 남은 사람이 1명이거나 모두 같은 금액을 걸었으면 판 종료 (playing 상태로 멈추지 않도록)
+    if playing and room_id in game_rooms and room.is_betting_complete():
+        await end_game(room_id)
+        return
+    
+    await broadcast_game_state(room_id)
+    await broadcast_room_list_update()
+
+@asynccontextmanager
+async def lobby_batch():
+    """블록 안에서 발생한 방 목록 브로드캐스트를 모아 마지막에 한 번만 전송"""
+    global lobby_batch_depth, lobby_update_pending
+    lobby_batch_depth += 1
+    try:
+        yield
+    finally:
+        lobby_batch_depth -= 1
+        if lobby_batch_depth == 0 and lobby_update_pending:
+            lobby_update_pending = False
             await broadcast_room_list_update()
-        
-        if player_id in connections:
-            del connections[player_id]
 
 async def broadcast_room_list_update():
     """방 목록 업데이트를 모든 구독자에게 브로드캐스트"""
+    global lobby_update_pending
     if not room_list_connections:
         return
+    if lobby_batch_depth:
+        lobby_update_pending = True
+        return
     
     try:
         rooms = await db.get_all_rooms()
@@ -332,7 +1109,7 @@ async def broadcast_room_list_update():
         disconnected = []
         for websocket in room_list_connections:
             try:
-                await websocket.send_json(message)
+                await send_message(websocket, message)
             except:
                 disconnected.append(websocket)
         
@@ -342,6 +1119,10 @@ async def broadcast_room_list_update():
     except Exception as e:
         print(f"방 목록 브로드캐스트 에러: {e}")
 
+# 클라이언트가 보낼 수 있는 메시지 타입 (메트릭 라벨 폭증 방지용)
+MESSAGE_TYPES = {"start_game", "bet", "ready", "sync"}
+
+@watchdog.trace_handler
 async def handle_message(room_id: str, player_id: str, data: dict):
     """WebSocket 메시지 처리"""
     room = game_rooms.get(room_id)
@@ -349,9 +1130,11 @@ async def handle_message(room_id: str, player_id: str, data: dict):
         return
     
     message_type = data.get("type")
+    metrics.messages_handled.inc(message_type if message_type in MESSAGE_TYPES else "unknown")
     
     if message_type == "start_game":
-        if len(room.players) >= 2:
+        # 진행 중인 판을 다시 돌리지 않음
+        if len(room.players) >= 2 and room.status != "playing":
             await start_game(room_id)
     
     elif message_type == "bet":
@@ -362,6 +1145,12 @@ async def handle_message(room_id: str, player_id: str, data: dict):
     elif message_type == "ready":
         room.set_player_ready(player_id)
         await broadcast_game_state(room_id)
+    
+    elif message_type == "sync":
+        # 변경분 순번이 맞지 않을 때 클라이언트가 전체 상태 요청
+        player = room.get_player(player_id)
+        if player:
+            await send_full_state(room, player)
 
 async def start_game(room_id: str):
     """게임 시작"""
@@ -369,17 +1158,20 @@ async def start_game(room_id: str):
     room.start_game()
     
     # 방 상태를 'playing'으로 업데이트
+    seat_index.update_room(room_id, waiting=False)
     await db.update_room_status(room_id, 'playing')
     
-    # 카드 배분
-    seotda_game = SeotdaGame()
-    for player in room.players:
-        cards = seotda_game.deal_cards()
+    # 카드 배분 (시드는 재현용으로 방에 기록)
+    dealt = dealer.deal(len(room.players))
+    room.hand_seed = dealt.seed
+    for player, cards in zip(room.players, dealt.hands):
         player.cards = cards
-        await player.websocket.send_json({
+        message = {
             "type": "cards_dealt",
             "cards": [{"suit": c.suit, "number": c.number} for c in cards]
-        })
+        }
+        room.events.append(message, player.id)
+        await send_to_player(player, message)
     
     # 게임 상태를 데이터베이스에 저장
     await db.save_game_state(room_id, room.to_dict())
@@ -397,7 +1189,18 @@ async def handle_bet(room_id: str, player_id: str, action: str, amount: int):
     if not player or room.current_player != player_id:
         return
     
+    # 레이즈는 현재 베팅보다 올리는 양의 정수만 허용 (음수 금액은 칩을 적립시킴)
+    if action == "raise" and (not isinstance(amount, int) or isinstance(amount, bool) or amount <= 0):
+        await send_to_player(player, {"type": "error", "message": "잘못된 베팅 금액입니다."})
+        return
+    
     bet_action = BetAction(player_id=player_id, action=action, amount=amount)
+    # 같은 계정이 여러 방에 앉아 있을 수 있으므로 이 방의 사본이 아닌 원장 잔액으로 확인
+    if player.uses_ledger:
+        player.chips = ledger.balance(player.name)
+    chips_before = player.chips
+    player_bet_before = player.current_bet
+    room_bet_before, pot_before = room.current_bet, room.current_pot
     
     if action == "call":
         bet_amount = room.current_bet - player.current_bet
@@ -435,6 +1238,19 @@ async def handle_bet(room_id: str, player_id: str, action: str, amount: int):
             if player.current_bet > room.current_bet:
                 room.current_bet = player.current_bet
     
+    # 베팅은 칩을 줄이기만 함 (늘어났다면 원장/스택에 쓰지 않고 되돌림)
+    spent = chips_before - player.chips
+    if spent < 0:
+        print(f"Bet would credit chips, rejected: {player.name} {action} {amount}")
+        player.chips, player.current_bet = chips_before, player_bet_before
+        room.current_bet, room.current_pot = room_bet_before, pot_before
+        return
+    
+    # 베팅한 칩을 원장(또는 토너먼트 스택)에 기록
+    if spent:
+        player.chips = chips_before
+        apply_chips(room_id, player, -spent, action)
+    
     # 다음 플레이어로 턴 넘기기
     room.next_turn()
     
@@ -454,11 +1270,31 @@ async def end_game(room_id: str):
         winner = active_players[0]
     else:
         # 카드 비교
-        seotda_game = SeotdaGame()
-        winner = seotda_game.determine_winner(active_players)
+        winner = hand_evaluator.determine_winner(active_players)
     
     # 승자에게 팟 지급
-    winner.chips += room.current_pot
+    pot = room.current_pot
+    if pot:
+        apply_chips(room_id, winner, pot, "payout")
+    
+    # 통계 갱신 및 게임 기록 저장
+    hand_results = [
+        {
+            "account": p.name,
+            "player_id": p.id,
+            "won": p is winner,
+            "pot": pot,
+            "contributed": p.current_bet,
+            "folded": p.folded,
+            "hand_name": hand_evaluator.get_hand_name(p.cards) if p.cards else None,
+        } for p in room.players
+    ]
+    # 봇과 토너먼트 칩(계정 잔액과 별도)은 순위표에서 제외
+    stats.record_hand([r for r, p in zip(hand_results, room.players) if p.uses_ledger])
+    await db.save_game_result(room_id, winner.id, pot, {
+        "hand_seed": room.hand_seed,
+        "players": hand_results
+    })
     
     # 게임 결과 전송
     await broadcast_game_result(room_id, winner)
@@ -467,18 +1303,128 @@ async def end_game(room_id: str):
     room.reset_game()
     
     # 방 상태를 'waiting'으로 업데이트
+    seat_index.update_room(room_id, waiting=True)
     await db.update_room_status(room_id, 'waiting')
     
-    # 방 목록 업데이트
-    await broadcast_room_list_update()
+    # 방 목록 업데이트 (토너먼트 테이블은 탈락/재배치 결과와 함께 한 번만 전송)
+    async with lobby_batch():
+        await broadcast_room_list_update()
+        
+        # 토너먼트 테이블이면 탈락/재배치 후 다음 판 예약
+        tour = tournaments.for_room(room_id)
+        if tour and tour.status == "running":
+            await advance_tournament(tour, room_id)
 
-async def broadcast_game_state(room_id: str):
-    """모든 플레이어에게 게임 상태 전송"""
+def apply_chips(room_id: str, player: Player, delta: int, reason: str):
+    """칩 변동 반영 (일반 자리는 원장, 토너먼트 자리는 토너먼트 스택, 봇은 자리에만)"""
+    tour = tournaments.for_room(room_id)
+    if tour and not player.uses_ledger and player.name in tour.stacks:
+        tour.stacks[player.name] += delta
+        player.chips = tour.stacks[player.name]
+    elif player.uses_ledger:
+        player.chips = ledger.record(player.name, player.id, room_id, delta, reason)
+    else:
+        player.chips += delta
+
+async def apply_bot_decision(room_id: str, bot_id: str, hand_number: int, action: str, amount: int):
+    """워커가 계산한 봇 결정 적용 (그 사이 판이 바뀌었으면 버리고 다시 요청)"""
     room = game_rooms.get(room_id)
-    if not room:
+    if not room or room.status != "playing" or room.current_player != bot_id:
+        return
+    if room.hand_number != hand_number:
+        bot_driver.request(room, room.get_player(bot_id))
         return
+    await handle_bet(room_id, bot_id, action, amount)
+
+bot_driver = BotDriver(apply_bot_decision)
+
+def tournament_seat(room_id: str, player_name: str) -> dict:
+    """토너먼트 테이블 자리 예약 및 접속 정보"""
+    reservation = seat_index.reserve(room_id, ttl=tournament.SEAT_TTL)
+    return {
+        "room_id": room_id,
+        "reservation": reservation,
+        "ws_url": f"/ws/{room_id}/{quote(player_name)}?reservation={reservation}"
+    }
+
+async def start_table(room_id: str):
+    """대기 중이고 2명 이상 앉은 테이블만 판 시작"""
+    room = game_rooms.get(room_id)
+    if room and room.status != "playing" and len(room.players) >= 2:
+        await start_game(room_id)
+
+async def start_tournament_tables(tour: Tournament) -> List[str]:
+    """토너먼트의 모든 테이블에서 동시에 판 시작 (방 목록 갱신은 한 번만)"""
+    room_ids = list(tour.tables)
+    async with lobby_batch():
+        results = await asyncio.gather(*(start_table(room_id) for room_id in room_ids), return_exceptions=True)
+    started = []
+    for room_id, result in zip(room_ids, results):
+        if isinstance(result, Exception):
+            print(f"Tournament table start error ({room_id}): {result}")
+        elif game_rooms.get(room_id) and game_rooms[room_id].status == "playing":
+            started.append(room_id)
+    return started
+
+async def start_tournament_tables_later(tour: Tournament):
+    """잠시 후 다음 판 시작 (이동한 플레이어가 새 테이블에 접속할 시간)"""
+    await asyncio.sleep(tournament.HAND_DELAY)
+    if tour.status == "running":
+        await start_tournament_tables(tour)
+
+async def unseat(room_id: str, player: Player, message: dict):
+    """안내 메시지를 보내고 자리에서 내보낸 뒤 연결 종료"""
+    websocket = player.websocket
+    try:
+        await send_to_player(player, message)
+    except:
+        pass
+    await remove_player(room_id, player.id)
+    if websocket is not None:
+        try:
+            await websocket.close()
+        except:
+            pass
+
+async def advance_tournament(tour: Tournament, room_id: str):
+    """토너먼트 테이블의 판이 끝난 뒤 탈락 처리, 테이블 재배치, 다음 판 예약"""
+    room = game_rooms.get(room_id)
+    async with lobby_batch():
+        # 칩이 부족한 참가자 탈락
+        for player in list(room.players) if room else []:
+            if player.chips >= tournament.MIN_CHIPS or player.name not in tour.tables.get(room_id, ()):
+                continue
+            tour.bust(player.name)
+            rank = next(s["rank"] for s in tour.standings() if s["name"] == player.name)
+            await unseat(room_id, player, {"type": "tournament_busted", "tournament_id": tour.id, "rank": rank})
+        if room_id not in tour.tables:
+            # 탈락으로 테이블이 비었음
+            tournaments.close_table(room_id)
+        
+        if tour.status == "finished":
+            for table_id in list(tour.tables):
+                table = game_rooms.get(table_id)
+                for player in list(table.players) if table else []:
+                    await send_to_player(player, {"type": "tournament_finished", **tour.to_dict()})
+            return
+        
+        # 진행 중인 판이 없는 테이블에서만 플레이어 이동
+        movable = [t for t in tour.tables if not game_rooms.get(t) or game_rooms[t].status != "playing"]
+        moves, closed = rebalance(tour.tables, tour.table_size, movable)
+        for name, source, target in moves:
+            seat = tournament_seat(target, name)
+            source_room = game_rooms.get(source)
+            player = next((p for p in source_room.players if p.name == name), None) if source_room else None
+            if player:
+                await unseat(source, player, {"type": "table_change", "tournament_id": tour.id, **seat})
+        for table_id in closed:
+            tournaments.close_table(table_id)
     
-    game_state = {
+    asyncio.create_task(start_tournament_tables_later(tour))
+
+def build_game_state(room: GameRoom) -> dict:
+    """브로드캐스트용 게임 상태 메시지 생성"""
+    return {
         "type": "game_state",
         "players": [
             {
@@ -487,7 +1433,9 @@ async def broadcast_game_state(room_id: str):
                 "chips": p.chips,
                 "current_bet": p.current_bet,
                 "folded": p.folded,
-                "ready": p.ready
+                "ready": p.ready,
+                "connected": p.connected or p.is_bot,
+                "is_bot": p.is_bot
             } for p in room.players
         ],
         "current_pot": room.current_pot,
@@ -495,12 +1443,59 @@ async def broadcast_game_state(room_id: str):
         "current_player": room.current_player,
         "status": room.status
     }
+
+async def broadcast_game_state(room_id: str):
+    """모든 플레이어에게 게임 상태 전송"""
+    room = game_rooms.get(room_id)
+    if not room:
+        return
+    
+    # 봇 차례면 결정 요청 (워커 풀에서 일괄 계산 후 handle_bet 으로 적용)
+    current = room.get_player(room.current_player) if room.status == "playing" else None
+    if current and current.is_bot:
+        bot_driver.request(room, current)
+    
+    game_state = build_game_state(room)
+    base_seq = room.last_state_seq
+    delta = protocol.diff_game_state(room.last_state, game_state) if room.last_state else None
+    seq = room.events.append(game_state)
+    room.last_state = game_state
+    room.last_state_seq = seq
+    
+    frame = Frame(game_state)
+    delta_frame = None
+    if delta is not None:
+        delta["seq"] = seq
+        delta["base_seq"] = base_seq
+        delta_frame = Frame(delta)
+    
+    # compact 연결은 좌석 번호로만 플레이어를 구분하므로 명단이 바뀌면 먼저 전송
+    roster = tuple(p.id for p in room.players)
+    roster_frame = None
     
     for player in room.players:
+        if not player.connected:
+            continue
         try:
-            await player.websocket.send_json(game_state)
+            if player.protocol == protocol.COMPACT and player.roster_sent != roster:
+                if roster_frame is None:
+                    roster_frame = protocol.encode_roster(game_state["players"])
+                await player.websocket.send_bytes(roster_frame)
+                player.roster_sent = roster
+            # 직전 상태를 받은 delta 구독자에게만 변경분 전송, 그 외에는 전체 상태
+            if player.deltas and delta_frame is not None and player.state_seq == base_seq:
+                await send_frame(player.websocket, delta_frame, player.protocol)
+            else:
+                await send_frame(player.websocket, frame, player.protocol)
+            player.state_seq = seq
         except:
             pass
+    
+    # 관전자에게는 같은 프레임을 공유 (대기열에 넣기만 하므로 여기서 기다리지 않음)
+    if spectators.count(room_id):
+        roster_frame = Frame({"type": "roster", "players": game_state["players"]})
+        dropped = spectators.publish(room_id, frame, roster, roster_frame)
+        metrics.spectator_frames_dropped.inc(amount=dropped)
 
 async def broadcast_game_result(room_id: str, winner: Player):
     """게임 결과 전송"""
@@ -520,11 +1515,12 @@ async def broadcast_game_result(room_id: str, winner: Player):
                 "cards": [{"suit": c.suit, "number": c.number} for c in p.cards] if p.cards else [],
                 "folded": p.folded
             } for p in room.players
-        ]
+        ],
+        "hand_seed": room.hand_seed
     }
     
-    for player in room.players:
-        try:
-            await player.websocket.send_json(result)
-        except:
-            pass
\ No newline at end of file
+    await broadcast_to_room(room, result)
+    
+    # 결과 공개 시점이므로 관전자에게도 모든 패 공개
+    if spectators.count(room_id):
+        spectators.publish(room_id, Frame(result))
\ No newline at end of file
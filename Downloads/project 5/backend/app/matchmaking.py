@@ -0,0 +1,183 @@
+import heapq
+import os
+import secrets
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+# 빠른 참가로 예약한 자리를 WebSocket 연결 전까지 유지하는 시간
+RESERVATION_SECONDS = float(os.getenv('SEAT_RESERVATION_SECONDS', '15'))
+
+
+@dataclass
+class RoomSeats:
+    """방 하나의 좌석 현황"""
+    room_id: str
+    max_players: int
+    seated: int = 0
+    is_private: bool = False
+    waiting: bool = True
+    # 예약 토큰 -> 만료 시각
+    reservations: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def free(self) -> int:
+        return self.max_players - self.seated - len(self.reservations)
+
+
+class SeatIndex:
+    """공개 대기방의 빈 자리 인덱스
+
+    빈 자리 수별 버킷(dict 를 순서 있는 집합으로 사용)에 방을 넣어 두고, 빠른 참가는
+    빈 자리가 가장 적은 버킷부터 찾는다 (최대 인원이 작으므로 사실상 O(1)).
+    예약 만료는 만료 시각 힙에서 이미 만료된 것만 꺼내 처리한다.
+    자리 확인과 차지는 await 없이 한 번에 처리하므로 이벤트 루프 안에서 원자적이다.
+    """
+
+    def __init__(self):
+        self.rooms: Dict[str, RoomSeats] = {}
+        self.buckets: Dict[int, Dict[str, None]] = {}
+        # (만료 시각, 방 id, 예약 토큰) 최소 힙 - 차지/정리된 예약은 꺼낼 때 건너뜀
+        self.expiries: List[Tuple[float, str, str]] = []
+
+    def _bucket_of(self, seats: RoomSeats) -> Optional[int]:
+        if seats.is_private or not seats.waiting or seats.free <= 0:
+            return None
+        return seats.free
+
+    def _rebucket(self, seats: RoomSeats, old_bucket: Optional[int]):
+        new_bucket = self._bucket_of(seats)
+        if old_bucket == new_bucket:
+            return
+        if old_bucket is not None:
+            self.buckets[old_bucket].pop(seats.room_id, None)
+        if new_bucket is not None:
+            self.buckets.setdefault(new_bucket, {})[seats.room_id] = None
+
+    def _expire(self, seats: RoomSeats, now: float):
+        """만료된 예약 정리"""
+        if not seats.reservations:
+            return
+        old_bucket = self._bucket_of(seats)
+        for token, expires_at in list(seats.reservations.items()):
+            if expires_at <= now:
+                del seats.reservations[token]
+        self._rebucket(seats, old_bucket)
+
+    def _expire_due(self, now: float):
+        """만료 시각이 지난 예약만 힙에서 꺼내 정리 (남은 예약 수와 무관)"""
+        while self.expiries and self.expiries[0][0] <= now:
+            _, room_id, token = heapq.heappop(self.expiries)
+            seats = self.rooms.get(room_id)
+            if not seats or token not in seats.reservations:
+                continue
+            old_bucket = self._bucket_of(seats)
+            del seats.reservations[token]
+            self._rebucket(seats, old_bucket)
+
+    def add_room(self, room_id: str, max_players: int, is_private: bool = False,
+                 seated: int = 0, waiting: bool = True) -> RoomSeats:
+        """방 등록 (이미 있으면 기존 항목 반환)"""
+        seats = self.rooms.get(room_id)
+        if seats:
+            return seats
+        seats = RoomSeats(room_id=room_id, max_players=max_players, seated=seated,
+                          is_private=bool(is_private), waiting=waiting)
+        self.rooms[room_id] = seats
+        self._rebucket(seats, None)
+        return seats
+
+    def register(self, room_data: dict) -> RoomSeats:
+        """DB 방 정보로 등록 (재시작 후 처음 접속하는 방)"""
+        return self.add_room(
+            room_data['id'],
+            room_data['max_players'],
+            is_private=room_data.get('is_private', False),
+            seated=room_data.get('current_players', 0),
+            waiting=room_data.get('status', 'waiting') == 'waiting',
+        )
+
+    def update_room(self, room_id: str, max_players: Optional[int] = None,
+                    is_private: Optional[bool] = None, waiting: Optional[bool] = None):
+        """방 설정/상태 변경 반영"""
+        seats = self.rooms.get(room_id)
+        if not seats:
+            return
+        old_bucket = self._bucket_of(seats)
+        if max_players is not None:
+            seats.max_players = max_players
+        if is_private is not None:
+            seats.is_private = bool(is_private)
+        if waiting is not None:
+            seats.waiting = waiting
+        self._rebucket(seats, old_bucket)
+
+    def remove_room(self, room_id: str):
+        seats = self.rooms.pop(room_id, None)
+        if seats:
+            bucket = self._bucket_of(seats)
+            if bucket is not None:
+                self.buckets[bucket].pop(room_id, None)
+
+    def find(self, now: Optional[float] = None) -> Optional[str]:
+        """빈 자리가 가장 적은 공개 대기방 (방을 빨리 채우기 위해)"""
+        now = time.monotonic() if now is None else now
+        # 만료된 예약을 먼저 정리해 버킷을 확정한 뒤 조회
+        # (조회 중에 만료로 다른 버킷으로 옮겨진 방을 놓치지 않도록)
+        self._expire_due(now)
+        for free in sorted(self.buckets):
+            for room_id in self.buckets[free]:
+                return room_id
+        return None
+
+    def reserve(self, room_id: str, ttl: float = RESERVATION_SECONDS) -> Optional[str]:
+        """자리 하나 예약 후 토큰 반환 (빈 자리가 없으면 None)"""
+        seats = self.rooms.get(room_id)
+        if not seats:
+            return None
+        now = time.monotonic()
+        self._expire(seats, now)
+        if seats.free <= 0:
+            return None
+        old_bucket = self._bucket_of(seats)
+        token = secrets.token_urlsafe(12)
+        seats.reservations[token] = now + ttl
+        heapq.heappush(self.expiries, (now + ttl, room_id, token))
+        self._rebucket(seats, old_bucket)
+        return token
+
+    def claim(self, room_id: str, reservation: Optional[str] = None) -> bool:
+        """예약한 자리 또는 빈 자리 차지 (실패하면 방이 가득 찬 것)"""
+        seats = self.rooms.get(room_id)
+        if not seats:
+            return False
+        self._expire(seats, time.monotonic())
+        old_bucket = self._bucket_of(seats)
+        if reservation and reservation in seats.reservations:
+            del seats.reservations[reservation]
+        elif seats.free <= 0:
+            return False
+        seats.seated += 1
+        self._rebucket(seats, old_bucket)
+        return True
+
+    def resync(self, room_id: str, seated: int):
+        """실제 착석 인원으로 보정 (DB 에 남은 고아 행을 정리한 뒤)"""
+        seats = self.rooms.get(room_id)
+        if not seats:
+            return
+        old_bucket = self._bucket_of(seats)
+        seats.seated = seated
+        self._rebucket(seats, old_bucket)
+
+    def release(self, room_id: str):
+        """플레이어 퇴장으로 자리 반환"""
+        seats = self.rooms.get(room_id)
+        if not seats:
+            return
+        old_bucket = self._bucket_of(seats)
+        seats.seated = max(0, seats.seated - 1)
+        self._rebucket(seats, old_bucket)
+
+
+seat_index = SeatIndex()
@@ -0,0 +1,225 @@
+import asyncio
+import bisect
+import functools
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# METRICS_ENABLED=0 이면 모든 계측이 no-op 이 되고 데코레이터는 원본 함수를 그대로 반환
+ENABLED = os.getenv('METRICS_ENABLED', '1') != '0'
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    """Prometheus 라벨 문자열 생성"""
+    parts = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    """단조 증가 카운터"""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.values: Dict[Tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def get(self, *labels) -> float:
+        return self.values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in self.values.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Gauge:
+    """현재 값 게이지 (스크레이프 시점에 콜백으로 계산 가능)"""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.values: Dict[Tuple, float] = {}
+        self.function: Optional[Callable[[], Dict[Tuple, float]]] = None
+
+    def set(self, value: float, *labels):
+        self.values[labels] = value
+
+    def set_function(self, function: Callable[[], Dict[Tuple, float]]):
+        """스크레이프 시점에 {라벨 튜플: 값} 을 반환하는 함수 등록"""
+        self.function = function
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        values = self.function() if self.function else self.values
+        for labels, value in values.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    """누적 버킷 히스토그램 (초 단위)"""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        # 라벨별 [버킷별 카운트..., +Inf 카운트], 합계
+        self.counts: Dict[Tuple, List[int]] = {}
+        self.sums: Dict[Tuple, float] = {}
+
+    def observe(self, value: float, *labels):
+        counts = self.counts.get(labels)
+        if counts is None:
+            counts = self.counts[labels] = [0] * (len(self.buckets) + 1)
+            self.sums[labels] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sums[labels] += value
+
+    def count(self, *labels) -> int:
+        return sum(self.counts.get(labels, ()))
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, counts in self.counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                label_str = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{label_str} {cumulative}")
+            label_str = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_str} {self.sums[labels]}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class _NoopMetric:
+    """비활성화 시 사용하는 빈 메트릭"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def inc(self, *labels, amount: float = 1):
+        pass
+
+    def set(self, value: float, *labels):
+        pass
+
+    def set_function(self, function):
+        pass
+
+    def observe(self, value: float, *labels):
+        pass
+
+    def get(self, *labels) -> float:
+        return 0
+
+    def count(self, *labels) -> int:
+        return 0
+
+    def render(self) -> List[str]:
+        return []
+
+
+class Registry:
+    """메트릭 모음 및 텍스트 노출"""
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        return self.register(Counter(name, help, labelnames) if ENABLED else _NoopMetric())
+
+    def gauge(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        return self.register(Gauge(name, help, labelnames) if ENABLED else _NoopMetric())
+
+    def histogram(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help, labelnames, buckets) if ENABLED else _NoopMetric())
+
+    def render(self) -> str:
+        """Prometheus 텍스트 포맷으로 변환"""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+db_query_seconds = registry.histogram(
+    "seotda_db_query_seconds", "Database 메서드별 쿼리 시간", ("method",))
+db_query_errors = registry.counter(
+    "seotda_db_query_errors_total", "Database 메서드별 실패 횟수", ("method",))
+ws_send_seconds = registry.histogram(
+    "seotda_ws_send_seconds", "WebSocket 메시지 전송 시간", ("type",))
+ws_send_failures = registry.counter(
+    "seotda_ws_send_failures_total", "WebSocket 메시지 전송 실패 횟수", ("type",))
+messages_handled = registry.counter(
+    "seotda_messages_handled_total", "handle_message 가 처리한 메시지 수", ("type",))
+rooms_live = registry.gauge(
+    "seotda_game_rooms", "메모리에 있는 게임룸 수", ("status",))
+players_live = registry.gauge(
+    "seotda_players", "게임룸에 접속한 플레이어 수")
+spectators_live = registry.gauge(
+    "seotda_spectators", "관전자 연결 수")
+spectator_frames_dropped = registry.counter(
+    "seotda_spectator_frames_dropped_total", "관전자에게 보내지 않고 건너뛴 프레임 수")
+admission_decisions = registry.counter(
+    "seotda_admission_decisions_total", "메시지/연결 허용 및 거부 결정 수", ("scope", "decision"))
+overload_level = registry.gauge(
+    "seotda_overload_level", "과부하 단계 (0 정상, 1 로비/방 생성 거부, 2 새 입장 거부)")
+inbound_pending = registry.gauge(
+    "seotda_inbound_messages_pending", "처리 대기 중인 수신 메시지 수")
+event_loop_lag_seconds = registry.histogram(
+    "seotda_event_loop_lag_seconds", "이벤트 루프 지연 시간",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+
+# 이벤트 루프 지연 측정값을 함께 받는 콜백 (과부하 판단 등, 메트릭 비활성화와 무관)
+lag_listeners: List[Callable[[float], None]] = []
+
+
+def track_db_query(func):
+    """Database 비동기 메서드의 실행 시간/실패 기록 데코레이터"""
+    if not ENABLED:
+        return func
+
+    method = func.__name__
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        except Exception:
+            db_query_errors.inc(method)
+            raise
+        finally:
+            db_query_seconds.observe(time.perf_counter() - start, method)
+
+    return wrapper
+
+
+async def monitor_event_loop_lag(interval: float = 0.5):
+    """주기적으로 sleep 하여 예정보다 늦게 깨어난 시간을 이벤트 루프 지연으로 기록하고 lag_listeners 에 전달"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - start - interval)
+        event_loop_lag_seconds.observe(lag)
+        for listener in lag_listeners:
+            listener(lag)
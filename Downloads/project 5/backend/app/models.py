@@ -2,6 +2,10 @@ from typing import List, Optional, Dict
 from fastapi import WebSocket
 from pydantic import BaseModel
 from dataclasses import dataclass
+from .sessions import EventBuffer
+
+# 게임룸 최대 인원
+MAX_PLAYERS = 4
 
 @dataclass
 class Card:
@@ -18,13 +22,25 @@ class Player:
         self.cards: List[Card] = []
         self.folded = False
         self.ready = False
+        self.protocol = "json"  # json 또는 compact
+        self.roster_sent: Optional[tuple] = None  # compact 연결에 마지막으로 보낸 명단
+        self.resume_token: Optional[str] = None  # 재접속 토큰
+        self.deltas = False  # game_state 변경분 수신 여부
+        self.state_seq: Optional[int] = None  # 마지막으로 받은 게임 상태 순번
+        self.is_bot = False  # 서버가 대신 베팅하는 봇 (WebSocket 없음)
+        self.uses_ledger = True  # False 면 칩을 원장이 아닌 자리(봇)나 토너먼트 스택에서 관리
+    
+    @property
+    def connected(self) -> bool:
+        """WebSocket 연결 여부 (재접속 유예 중이면 False)"""
+        return self.websocket is not None
     
     def reset_for_new_game(self):
         """새 게임을 위한 초기화"""
         self.current_bet = 0
         self.cards = []
         self.folded = False
-        self.ready = False
+        self.ready = self.is_bot  # 봇은 항상 준비 상태
 
 class GameRoom:
     def __init__(self, room_id: str):
@@ -36,10 +52,15 @@ class GameRoom:
         self.current_player = None
         self.player_turn_index = 0
         self.betting_round = 0
+        self.hand_seed: Optional[int] = None  # 현재 핸드 배분 시드 (재현용)
+        self.hand_number = 0  # 판마다 1씩 증가 (시드가 없는 보안 모드에서도 판 구분용)
+        self.events = EventBuffer()  # 재접속 시 재전송할 최근 이벤트
+        self.last_state: Optional[Dict] = None  # 마지막으로 브로드캐스트한 게임 상태
+        self.last_state_seq = 0
     
     def add_player(self, player: Player):
         """플레이어 추가"""
-        if len(self.players) < 4:
+        if len(self.players) < MAX_PLAYERS:
             self.players.append(player)
     
     def remove_player(self, player_id: str):
@@ -59,6 +80,7 @@ class GameRoom:
         """게임 시작"""
         if len(self.players) >= 2:
             self.status = "playing"
+            self.hand_number += 1
             self.current_player = self.players[0].id
             self.player_turn_index = 0
             self.current_bet = 10  # 기본 베팅 금액
@@ -73,15 +95,15 @@ class GameRoom:
         if len(active_players) <= 1:
             return
         
-        current_index = None
-        for i, player in enumerate(active_players):
+        # 현재 플레이어가 방금 다이했을 수 있으므로 전체 좌석 순서에서 다음 사람을 찾음
+        for i, player in enumerate(self.players):
             if player.id == self.current_player:
-                current_index = i
-                break
-        
-        if current_index is not None:
-            next_index = (current_index + 1) % len(active_players)
-            self.current_player = active_players[next_index].id
+                for offset in range(1, len(self.players)):
+                    candidate = self.players[(i + offset) % len(self.players)]
+                    if not candidate.folded:
+                        self.current_player = candidate.id
+                        return
+                return
     
     def is_betting_complete(self) -> bool:
         """베팅 라운드 완료 확인"""
@@ -102,6 +124,7 @@ class GameRoom:
         self.current_player = None
         self.player_turn_index = 0
         self.betting_round = 0
+        self.hand_seed = None
         
         for player in self.players:
             player.reset_for_new_game()
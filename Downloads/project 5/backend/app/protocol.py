@@ -0,0 +1,222 @@
+"""WebSocket 메시지 인코딩
+
+기본은 JSON 텍스트 프레임이고, 클라이언트가 서브프로토콜 ``seotda.compact.v1``
+(또는 ``?protocol=compact``) 을 요청하면 아래의 바이너리 프레임을 사용한다.
+모든 정수는 빅엔디언이며 첫 바이트는 메시지 코드다.
+
+서버 -> 클라이언트
+  0x01 game_state   B status, B n, b 현재 턴 좌석(-1 없음), I pot, I bet,
+                    n x (I chips, I current_bet, B flags[1=folded, 2=ready, 4=연결 끊김, 8=봇])
+  0x02 roster       B n, n x (B id 길이, id, H 이름 길이, 이름 UTF-8)
+                    좌석 순서는 game_state 의 플레이어 순서와 같음
+  0x03 cards_dealt  B n, n x 카드
+  0x04 game_result  B n, b 승자 좌석, n x (B folded, B 카드 수, 카드...),
+                    B 시드 여부, [Q hand_seed]
+  0x7F json         UTF-8 JSON (전용 코드가 없는 메시지)
+
+클라이언트 -> 서버
+  0x40 start_game
+  0x41 bet          B action, I amount
+  0x42 ready
+  0x43 sync         전체 게임 상태 재요청
+
+카드는 1바이트: 상위 4비트 무늬 번호(SUITS 순서), 하위 4비트 숫자.
+"""
+import json
+import struct
+from typing import Dict, List, Optional
+
+from .game_logic import SUITS
+
+JSON = "json"
+COMPACT = "compact"
+COMPACT_SUBPROTOCOL = "seotda.compact.v1"
+
+GAME_STATE = 0x01
+ROSTER = 0x02
+CARDS_DEALT = 0x03
+GAME_RESULT = 0x04
+JSON_FALLBACK = 0x7F
+
+START_GAME = 0x40
+BET = 0x41
+READY = 0x42
+SYNC = 0x43
+
+STATUSES = ("waiting", "playing", "finished")
+ACTIONS = ("call", "raise", "fold", "all_in", "half")
+
+_STATUS_CODES = {status: i for i, status in enumerate(STATUSES)}
+_SUIT_CODES = {suit: i for i, suit in enumerate(SUITS)}
+
+_STATE_HEADER = struct.Struct("!BBBbII")
+_STATE_PLAYER = struct.Struct("!IIB")
+_BET = struct.Struct("!BBI")
+
+
+def negotiate(websocket) -> Optional[str]:
+    """요청된 프로토콜 확인 (compact 이면 accept 에 넘길 서브프로토콜 반환)"""
+    if COMPACT_SUBPROTOCOL in websocket.scope.get("subprotocols", []):
+        return COMPACT_SUBPROTOCOL
+    return None
+
+
+def requested_protocol(websocket) -> str:
+    """연결이 사용할 프로토콜"""
+    if negotiate(websocket) or websocket.query_params.get("protocol") == COMPACT:
+        return COMPACT
+    return JSON
+
+
+def encode_card(card: Dict) -> int:
+    return (_SUIT_CODES[card["suit"]] << 4) | card["number"]
+
+
+def decode_card(value: int) -> Dict:
+    return {"suit": SUITS[value >> 4], "number": value & 0x0F}
+
+
+def _seat_of(players: List[Dict], player_id: Optional[str]) -> int:
+    for seat, player in enumerate(players):
+        if player["id"] == player_id:
+            return seat
+    return -1
+
+
+def encode_game_state(message: Dict) -> bytes:
+    players = message["players"]
+    parts = [_STATE_HEADER.pack(
+        GAME_STATE,
+        _STATUS_CODES.get(message["status"], 0),
+        len(players),
+        _seat_of(players, message["current_player"]),
+        message["current_pot"],
+        message["current_bet"],
+    )]
+    for p in players:
+        flags = (1 if p["folded"] else 0) | (2 if p.get("ready") else 0) | (0 if p.get("connected", True) else 4)
+        if p.get("is_bot"):
+            flags |= 8
+        parts.append(_STATE_PLAYER.pack(p["chips"], p["current_bet"], flags))
+    return b"".join(parts)
+
+
+def encode_roster(players: List[Dict]) -> bytes:
+    """좌석 순서대로 플레이어 id/이름 전송 (명단이 바뀔 때만)"""
+    parts = [bytes((ROSTER, len(players)))]
+    for p in players:
+        player_id = p["id"].encode()
+        name = p["name"].encode()
+        parts.append(struct.pack(f"!B{len(player_id)}sH{len(name)}s", len(player_id), player_id, len(name), name))
+    return b"".join(parts)
+
+
+def encode_game_result(message: Dict) -> bytes:
+    players = message["all_players"]
+    parts = [struct.pack("!BBb", GAME_RESULT, len(players), _seat_of(players, message["winner"]["id"]))]
+    for p in players:
+        cards = p["cards"]
+        parts.append(bytes([1 if p["folded"] else 0, len(cards)] + [encode_card(c) for c in cards]))
+    seed = message.get("hand_seed")
+    parts.append(struct.pack("!BQ", 1, seed) if seed is not None else b"\x00")
+    return b"".join(parts)
+
+
+def diff_game_state(old: Dict, new: Dict) -> Optional[Dict]:
+    """두 game_state 의 변경분 (좌석 구성이 바뀌었으면 None - 전체 상태를 보내야 함)
+
+    {"type": "game_state_delta", "changes": {바뀐 최상위 필드}, "players": {id: {바뀐 필드}}}
+    """
+    old_players = old["players"]
+    new_players = new["players"]
+    if len(old_players) != len(new_players) or any(
+            o["id"] != n["id"] for o, n in zip(old_players, new_players)):
+        return None
+
+    changes = {key: value for key, value in new.items()
+               if key not in ("type", "players", "seq") and old.get(key) != value}
+    players = {}
+    for o, n in zip(old_players, new_players):
+        changed = {key: value for key, value in n.items() if o.get(key) != value}
+        if changed:
+            players[n["id"]] = changed
+    return {"type": "game_state_delta", "changes": changes, "players": players}
+
+
+def encode_compact(message: Dict) -> bytes:
+    """메시지를 compact 바이너리 프레임으로 인코딩"""
+    message_type = message.get("type")
+    if message_type == "game_state":
+        return encode_game_state(message)
+    if message_type == "cards_dealt":
+        cards = message["cards"]
+        return bytes([CARDS_DEALT, len(cards)] + [encode_card(c) for c in cards])
+    if message_type == "game_result":
+        return encode_game_result(message)
+    if message_type == "roster":
+        return encode_roster(message["players"])
+    return bytes((JSON_FALLBACK,)) + encode_json(message).encode()
+
+
+def encode_json(message: Dict) -> str:
+    """메시지를 JSON 텍스트로 인코딩 (Starlette send_json 과 동일한 형식, DB 의 datetime 은 문자열로)"""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def decode_client(data: bytes) -> Dict:
+    """클라이언트 compact 프레임을 handle_message 용 dict 로 변환"""
+    if not data:
+        return {}
+    code = data[0]
+    if code == START_GAME:
+        return {"type": "start_game"}
+    if code == READY:
+        return {"type": "ready"}
+    if code == SYNC:
+        return {"type": "sync"}
+    if code == BET and len(data) == _BET.size:
+        _, action, amount = _BET.unpack(data)
+        if action < len(ACTIONS):
+            return {"type": "bet", "action": ACTIONS[action], "amount": amount}
+    if code == JSON_FALLBACK:
+        return json.loads(data[1:].decode())
+    return {}
+
+
+def encode_client(message: Dict) -> bytes:
+    """클라이언트 메시지를 compact 프레임으로 인코딩 (decode_client 의 역변환)"""
+    message_type = message.get("type")
+    if message_type == "start_game":
+        return bytes((START_GAME,))
+    if message_type == "ready":
+        return bytes((READY,))
+    if message_type == "sync":
+        return bytes((SYNC,))
+    if message_type == "bet" and message.get("action") in ACTIONS:
+        return _BET.pack(BET, ACTIONS.index(message["action"]), message.get("amount", 0))
+    return bytes((JSON_FALLBACK,)) + encode_json(message).encode()
+
+
+class Frame:
+    """한 번 인코딩해 여러 연결에 공유하는 메시지"""
+
+    __slots__ = ("message", "_json", "_compact")
+
+    def __init__(self, message: Dict):
+        self.message = message
+        self._json = None
+        self._compact = None
+
+    @property
+    def type(self) -> str:
+        return self.message.get("type", "unknown")
+
+    def encoded(self, protocol: str):
+        """프로토콜별 인코딩 결과 (최초 요청 시 한 번만 인코딩)"""
+        if protocol == COMPACT:
+            if self._compact is None:
+                self._compact = encode_compact(self.message)
+            return self._compact
+        if self._json is None:
+            self._json = encode_json(self.message)
+        return self._json
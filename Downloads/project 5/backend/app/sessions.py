@@ -0,0 +1,87 @@
+import asyncio
+import os
+import secrets
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# 연결이 끊긴 플레이어의 자리를 유지하는 시간 (0 이면 즉시 퇴장)
+GRACE_SECONDS = float(os.getenv('SESSION_GRACE_SECONDS', '30'))
+# 방마다 재접속 시 재전송용으로 보관하는 최근 이벤트 수
+EVENT_BUFFER_SIZE = int(os.getenv('EVENT_BUFFER_SIZE', '64'))
+
+
+class EventBuffer:
+    """방 단위 최근 이벤트 버퍼 (순번 부여 및 재전송)"""
+
+    def __init__(self, maxlen: int = EVENT_BUFFER_SIZE):
+        self.seq = 0
+        # (seq, 대상 player_id 또는 None(전체), 메시지)
+        self.events: deque = deque(maxlen=maxlen)
+
+    def append(self, message: Dict, player_id: Optional[str] = None) -> int:
+        """이벤트에 순번을 붙여 기록"""
+        self.seq += 1
+        message["seq"] = self.seq
+        self.events.append((self.seq, player_id, message))
+        return self.seq
+
+    def since(self, last_seq: int, player_id: str) -> Optional[List[Dict]]:
+        """last_seq 이후 해당 플레이어가 받아야 할 이벤트 (버퍼에서 밀려났으면 None)"""
+        if last_seq >= self.seq:
+            return []
+        if not self.events or self.events[0][0] > last_seq + 1:
+            return None
+        return [message for seq, target, message in self.events
+                if seq > last_seq and (target is None or target == player_id)]
+
+
+@dataclass
+class Session:
+    """재접속 토큰으로 찾는 플레이어 자리"""
+    token: str
+    room_id: str
+    player_id: str
+    expiry: Optional[asyncio.Task] = field(default=None, repr=False)
+
+
+class SessionStore:
+    """재접속 토큰 관리"""
+
+    def __init__(self):
+        self.sessions: Dict[str, Session] = {}
+
+    def create(self, room_id: str, player_id: str) -> Session:
+        session = Session(token=secrets.token_urlsafe(16), room_id=room_id, player_id=player_id)
+        self.sessions[session.token] = session
+        return session
+
+    def get(self, token: Optional[str]) -> Optional[Session]:
+        if not token:
+            return None
+        return self.sessions.get(token)
+
+    def discard(self, token: str):
+        session = self.sessions.pop(token, None)
+        if session:
+            self.cancel_expiry(session)
+
+    def schedule_expiry(self, session: Session, callback, delay: float = GRACE_SECONDS):
+        """유예 시간 후 callback() 실행 (재접속하면 취소)"""
+        self.cancel_expiry(session)
+
+        async def expire():
+            await asyncio.sleep(delay)
+            session.expiry = None
+            self.sessions.pop(session.token, None)
+            await callback()
+
+        session.expiry = asyncio.create_task(expire())
+
+    def cancel_expiry(self, session: Session):
+        if session.expiry is not None and session.expiry is not asyncio.current_task():
+            session.expiry.cancel()
+        session.expiry = None
+
+
+sessions = SessionStore()
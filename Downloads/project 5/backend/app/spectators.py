@@ -0,0 +1,124 @@
+import asyncio
+import os
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional
+
+from .protocol import COMPACT, Frame
+
+# 방 하나에 허용하는 최대 관전자 수
+MAX_SPECTATORS = int(os.getenv('MAX_SPECTATORS_PER_ROOM', '5000'))
+# 관전자 한 명에게 프레임을 보내는 최소 간격 (초) - 그 사이의 game_state 는 최신 것만 전송
+MIN_INTERVAL = float(os.getenv('SPECTATOR_MIN_INTERVAL', '0.2'))
+# 관전자별 대기 프레임 최대 개수 (넘치면 오래된 것부터 버림)
+MAX_PENDING = int(os.getenv('SPECTATOR_MAX_PENDING', '8'))
+
+# 최신 것 하나만 보내면 되는 프레임 타입
+COALESCE_TYPES = {"game_state"}
+
+
+class Spectator:
+    """읽기 전용 관전자 연결"""
+
+    def __init__(self, websocket, protocol_name: str):
+        self.websocket = websocket
+        self.protocol = protocol_name
+        self.pending: deque = deque()
+        self.wakeup = asyncio.Event()
+        self.roster_sent: Optional[tuple] = None
+        self.closing = False
+        self.dropped = 0
+
+    def push(self, frame: Frame) -> bool:
+        """대기열에 프레임 추가 (await 없음). 버린 프레임이 있으면 False"""
+        dropped = False
+        if frame.type in COALESCE_TYPES and self.pending and self.pending[-1].type == frame.type:
+            # 아직 보내지 못한 이전 상태는 최신 상태로 교체
+            self.pending[-1] = frame
+            dropped = True
+        else:
+            self.pending.append(frame)
+            if len(self.pending) > MAX_PENDING:
+                self.pending.popleft()
+                dropped = True
+        if dropped:
+            self.dropped += 1
+        self.wakeup.set()
+        return not dropped
+
+
+class SpectatorHub:
+    """방별 관전자 관리 및 공유 프레임 배포
+
+    publish 는 각 관전자의 대기열에 이미 인코딩된 Frame 을 넣기만 하고, 실제 전송은
+    관전자별 전송 태스크가 처리한다. 느린 관전자가 있어도 착석한 플레이어에게 보내는
+    브로드캐스트는 기다리지 않는다.
+    """
+
+    def __init__(self):
+        self.rooms: Dict[str, Dict[Spectator, None]] = {}
+
+    def count(self, room_id: Optional[str] = None) -> int:
+        if room_id is None:
+            return sum(len(spectators) for spectators in self.rooms.values())
+        return len(self.rooms.get(room_id, ()))
+
+    def add(self, room_id: str, spectator: Spectator) -> bool:
+        spectators = self.rooms.setdefault(room_id, {})
+        if len(spectators) >= MAX_SPECTATORS:
+            return False
+        spectators[spectator] = None
+        return True
+
+    def remove(self, room_id: str, spectator: Spectator):
+        spectators = self.rooms.get(room_id)
+        if spectators is None:
+            return
+        spectators.pop(spectator, None)
+        if not spectators:
+            del self.rooms[room_id]
+
+    def publish(self, room_id: str, frame: Frame, roster: Optional[tuple] = None,
+                roster_frame: Optional[Frame] = None) -> int:
+        """방의 모든 관전자에게 프레임 배포, 버린(건너뛴) 프레임 수 반환
+
+        compact 관전자는 좌석 번호만 받으므로 명단이 바뀌었으면 roster_frame 을 먼저 넣는다.
+        """
+        dropped = 0
+        for spectator in self.rooms.get(room_id, ()):
+            if roster_frame is not None and spectator.protocol == COMPACT and spectator.roster_sent != roster:
+                spectator.push(roster_frame)
+                spectator.roster_sent = roster
+            if not spectator.push(frame):
+                dropped += 1
+        return dropped
+
+    def close_room(self, room_id: str, frame: Optional[Frame] = None):
+        """방이 사라지면 마지막 프레임을 보내고 모든 관전자 연결 종료"""
+        for spectator in self.rooms.pop(room_id, {}):
+            if frame is not None:
+                spectator.push(frame)
+            spectator.closing = True
+            spectator.wakeup.set()
+
+    async def serve(self, spectator: Spectator, send: Callable[..., Awaitable[None]]):
+        """관전자 전송 태스크: 대기열을 비우고 MIN_INTERVAL 만큼 쉰다"""
+        try:
+            while True:
+                await spectator.wakeup.wait()
+                spectator.wakeup.clear()
+                while spectator.pending:
+                    frame = spectator.pending.popleft()
+                    await send(spectator.websocket, frame, spectator.protocol)
+                if spectator.closing:
+                    await spectator.websocket.close()
+                    return
+                if MIN_INTERVAL > 0:
+                    await asyncio.sleep(MIN_INTERVAL)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # 연결이 끊긴 관전자 - 수신 루프에서 정리됨
+            pass
+
+
+spectators = SpectatorHub()
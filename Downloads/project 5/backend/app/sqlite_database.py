@@ -0,0 +1,521 @@
+import json
+import os
+import sqlite3
+from typing import Dict, List, Optional
+
+from .database import Database, SCHEMA_VERSION, HISTORY_TABLE_PATTERN, history_table_name
+from .metrics import track_db_query
+
+# 내장 DB 파일 경로 (':memory:' 이면 프로세스 메모리에만 유지)
+SQLITE_PATH = os.getenv('SQLITE_PATH', 'seotda.db')
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS game_rooms (
+        id VARCHAR(50) PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        description TEXT,
+        max_players INT DEFAULT 4,
+        current_players INT DEFAULT 0,
+        status VARCHAR(20) DEFAULT 'waiting',
+        current_pot INT DEFAULT 0,
+        current_bet INT DEFAULT 0,
+        is_private BOOLEAN DEFAULT FALSE,
+        password VARCHAR(100),
+        created_by VARCHAR(100),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    # MySQL 의 ON UPDATE CURRENT_TIMESTAMP 대신 트리거 사용
+    """
+    CREATE TRIGGER IF NOT EXISTS game_rooms_updated_at AFTER UPDATE ON game_rooms
+    WHEN NEW.updated_at = OLD.updated_at
+    BEGIN
+        UPDATE game_rooms SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+    END
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS players (
+        id VARCHAR(50) PRIMARY KEY,
+        room_id VARCHAR(50),
+        name VARCHAR(100),
+        chips INT DEFAULT 1000,
+        current_bet INT DEFAULT 0,
+        folded BOOLEAN DEFAULT FALSE,
+        cards JSON,
+        is_ready BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (room_id) REFERENCES game_rooms(id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS chip_ledger (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        account VARCHAR(100) NOT NULL,
+        player_id VARCHAR(50),
+        room_id VARCHAR(50),
+        delta INT NOT NULL,
+        reason VARCHAR(20) NOT NULL,
+        balance_after INT NOT NULL,
+        created_at TIMESTAMP DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_chip_ledger_account ON chip_ledger (account)",
+    """
+    CREATE TABLE IF NOT EXISTS chip_balances (
+        account VARCHAR(100) PRIMARY KEY,
+        balance INT NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS player_stats (
+        account VARCHAR(100) PRIMARY KEY,
+        hands_played INT NOT NULL DEFAULT 0,
+        hands_won INT NOT NULL DEFAULT 0,
+        biggest_pot INT NOT NULL DEFAULT 0,
+        net_chips BIGINT NOT NULL DEFAULT 0,
+        hand_types JSON,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    "CREATE TABLE IF NOT EXISTS schema_version (version INT NOT NULL)",
+]
+
+# 기간별 게임 기록 테이블 (save_game_result 에서 생성)
+HISTORY_DDL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        room_id VARCHAR(50),
+        winner_id VARCHAR(50),
+        pot_amount INT,
+        game_data JSON,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+HISTORY_INDEX_DDL = "CREATE INDEX IF NOT EXISTS idx_{table}_room_id ON {table} (room_id)"
+
+ROOM_COLUMNS = """
+    r.id, r.name, r.description, r.max_players, r.status, r.current_pot, r.current_bet,
+    r.is_private, r.password, r.created_by, r.created_at, r.updated_at
+"""
+
+
+class SQLiteDatabase(Database):
+    """로컬 파일 SQLite 저장소 (WAL 모드, 단일 노드/엣지 배포 및 벤치마크용)
+
+    네트워크 왕복이 없고 별도 서버가 필요 없다. 연결 하나를 이벤트 루프 스레드에서만
+    사용하며 MySQL 저장소와 같은 결과(딕셔너리 행, datetime 타임스탬프)를 반환한다.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.connection: Optional[sqlite3.Connection] = None
+        self.path = path or SQLITE_PATH
+        # 이미 만든 기간별 기록 테이블
+        self.history_tables = set()
+
+    async def connect(self):
+        """데이터베이스 연결"""
+        try:
+            directory = os.path.dirname(self.path)
+            if directory and self.path != ':memory:':
+                os.makedirs(directory, exist_ok=True)
+            self.connection = sqlite3.connect(
+                self.path,
+                isolation_level=None,  # autocommit, 트랜잭션은 BEGIN 으로 직접 시작
+                detect_types=sqlite3.PARSE_DECLTYPES,
+            )
+            self.connection.row_factory = sqlite3.Row
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute("PRAGMA foreign_keys=ON")
+            self.connection.execute("PRAGMA busy_timeout=5000")
+            return True
+        except (sqlite3.Error, OSError) as e:
+            print(f"Database connection error: {e}")
+            self.connection = None
+            return False
+
+    async def _conn(self) -> sqlite3.Connection:
+        if not self.connection:
+            await self.connect()
+        return self.connection
+
+    def get_schema_version(self) -> Optional[int]:
+        """저장된 스키마 버전 (테이블이 없으면 None)"""
+        try:
+            row = self.connection.execute("SELECT version FROM schema_version LIMIT 1").fetchone()
+            return row[0] if row else None
+        except sqlite3.Error:
+            return None
+
+    async def init_database(self) -> bool:
+        """데이터베이스 초기화 (스키마가 최신이면 DDL 생략, DDL 을 실행해 성공했으면 True)"""
+        self.schema_error = None
+        await self.connect()
+        if not self.connection:
+            self.schema_error = f"cannot open {self.path}"
+            return False
+        if self.get_schema_version() == SCHEMA_VERSION:
+            print(f"Database schema is up to date (version {SCHEMA_VERSION})")
+            return False
+        try:
+            self.connection.execute("BEGIN")
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+            # 이전 버전의 단일 game_history 테이블은 현재 기간 테이블로 옮김
+            table = history_table_name()
+            existing = {row[0] for row in self.connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('game_history', ?)", (table,))}
+            if existing == {'game_history'}:
+                self.connection.execute(f"ALTER TABLE game_history RENAME TO {table}")
+                self.connection.execute(HISTORY_INDEX_DDL.format(table=table))
+            self.connection.execute("DELETE FROM schema_version")
+            self.connection.execute("INSERT INTO schema_version (version) VALUES (?)", (SCHEMA_VERSION,))
+            self.connection.commit()
+            print("Database initialized successfully")
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            print(f"Database initialization error: {e}")
+            self.schema_error = str(e)
+            return False
+        return True
+
+    @track_db_query
+    async def create_room(self, room_data: dict):
+        """게임룸 생성"""
+        connection = await self._conn()
+        connection.execute(
+            "INSERT INTO game_rooms (id, name, description, max_players, is_private, password, created_by) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                room_data['id'],
+                room_data['name'],
+                room_data.get('description', ''),
+                room_data.get('max_players', 4),
+                room_data.get('is_private', False),
+                room_data.get('password'),
+                room_data.get('created_by'),
+            )
+        )
+
+    @track_db_query
+    async def create_rooms(self, rooms: List[dict]):
+        """게임룸 일괄 생성 (토너먼트 테이블 등)"""
+        if not rooms:
+            return
+        connection = await self._conn()
+        try:
+            connection.execute("BEGIN")
+            connection.executemany(
+                "INSERT INTO game_rooms (id, name, description, max_players, is_private, password, created_by) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(
+                    room['id'],
+                    room['name'],
+                    room.get('description', ''),
+                    room.get('max_players', 4),
+                    room.get('is_private', False),
+                    room.get('password'),
+                    room.get('created_by'),
+                ) for room in rooms]
+            )
+            connection.commit()
+        except sqlite3.Error:
+            connection.rollback()
+            raise
+
+    @track_db_query
+    async def get_all_rooms(self):
+        """모든 게임룸 조회"""
+        connection = await self._conn()
+        rows = connection.execute(f"""
+            SELECT {ROOM_COLUMNS}, COUNT(p.id) as current_players
+            FROM game_rooms r
+            LEFT JOIN players p ON r.id = p.room_id
+            GROUP BY r.id
+            ORDER BY r.created_at DESC
+        """).fetchall()
+        return [dict(row) for row in rows]
+
+    @track_db_query
+    async def get_live_rooms(self):
+        """메모리 워밍업용 전체 게임룸과 인원 수 (한 번의 쿼리)"""
+        connection = await self._conn()
+        rows = connection.execute("""
+            SELECT r.id, r.max_players, r.is_private, r.status,
+                   COUNT(p.id) as current_players
+            FROM game_rooms r
+            LEFT JOIN players p ON r.id = p.room_id
+            GROUP BY r.id
+        """).fetchall()
+        return [dict(row) for row in rows]
+
+    @track_db_query
+    async def reset_interrupted_games(self):
+        """재시작으로 끊긴 게임을 대기 상태로 되돌림"""
+        connection = await self._conn()
+        cursor = connection.execute(
+            "UPDATE game_rooms SET status = 'waiting', current_pot = 0, current_bet = 0 WHERE status = 'playing'")
+        return cursor.rowcount
+
+    @track_db_query
+    async def clear_players(self):
+        """재시작 전 접속해 있던 플레이어 행 삭제 (메모리에 없는 자리이므로 모두 정리)"""
+        connection = await self._conn()
+        count = connection.execute("DELETE FROM players").rowcount
+        connection.execute("UPDATE game_rooms SET current_players = 0 WHERE current_players <> 0")
+        return count
+
+    @track_db_query
+    async def get_room_by_id(self, room_id: str):
+        """특정 게임룸 조회"""
+        connection = await self._conn()
+        row = connection.execute(f"""
+            SELECT {ROOM_COLUMNS}, COUNT(p.id) as current_players
+            FROM game_rooms r
+            LEFT JOIN players p ON r.id = p.room_id
+            WHERE r.id = ?
+            GROUP BY r.id
+        """, (room_id,)).fetchone()
+        return dict(row) if row else None
+
+    @track_db_query
+    async def update_room(self, room_id: str, room_data: dict):
+        """게임룸 정보 수정"""
+        connection = await self._conn()
+        fields = [f for f in ('name', 'description', 'max_players', 'is_private', 'password') if f in room_data]
+        if fields:
+            assignments = ", ".join(f"{field} = ?" for field in fields)
+            values = [room_data[field] for field in fields] + [room_id]
+            connection.execute(f"UPDATE game_rooms SET {assignments} WHERE id = ?", values)
+
+    @track_db_query
+    async def delete_room(self, room_id: str):
+        """게임룸 삭제"""
+        connection = await self._conn()
+        connection.execute("DELETE FROM game_rooms WHERE id = ?", (room_id,))
+
+    @track_db_query
+    async def add_player_to_room(self, room_id: str, player_id: str, player_name: str):
+        """플레이어를 게임룸에 추가"""
+        connection = await self._conn()
+        connection.execute("INSERT INTO players (id, room_id, name) VALUES (?, ?, ?)",
+                           (player_id, room_id, player_name))
+        self._update_player_count(connection, room_id)
+
+    @track_db_query
+    async def remove_player_from_room(self, room_id: str, player_id: str):
+        """플레이어를 게임룸에서 제거"""
+        connection = await self._conn()
+        connection.execute("DELETE FROM players WHERE id = ? AND room_id = ?", (player_id, room_id))
+        self._update_player_count(connection, room_id)
+
+    def _update_player_count(self, connection: sqlite3.Connection, room_id: str):
+        """방의 현재 플레이어 수 업데이트"""
+        connection.execute(
+            "UPDATE game_rooms SET current_players = (SELECT COUNT(*) FROM players WHERE room_id = ?) WHERE id = ?",
+            (room_id, room_id)
+        )
+
+    @track_db_query
+    async def get_room_players(self, room_id: str):
+        """방의 플레이어 목록 조회"""
+        connection = await self._conn()
+        rows = connection.execute("SELECT * FROM players WHERE room_id = ? ORDER BY created_at, rowid",
+                                  (room_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+    @track_db_query
+    async def update_room_status(self, room_id: str, status: str):
+        """방 상태 업데이트"""
+        connection = await self._conn()
+        connection.execute("UPDATE game_rooms SET status = ? WHERE id = ?", (status, room_id))
+
+    @track_db_query
+    async def save_game_state(self, room_id: str, game_data: dict):
+        """게임 상태 저장"""
+        connection = await self._conn()
+        connection.execute(
+            "UPDATE game_rooms SET status = ?, current_pot = ?, current_bet = ? WHERE id = ?",
+            (game_data.get('status'), game_data.get('current_pot'), game_data.get('current_bet'), room_id)
+        )
+
+    @track_db_query
+    async def save_game_result(self, room_id: str, winner_id: str, pot_amount: int, game_data: dict):
+        """게임 결과 저장 (현재 기간 테이블)"""
+        connection = await self._conn()
+        table = history_table_name()
+        if table not in self.history_tables:
+            connection.execute(HISTORY_DDL.format(table=table))
+            connection.execute(HISTORY_INDEX_DDL.format(table=table))
+            self.history_tables.add(table)
+        connection.execute(
+            f"INSERT INTO {table} (room_id, winner_id, pot_amount, game_data) VALUES (?, ?, ?, ?)",
+            (room_id, winner_id, pot_amount, json.dumps(game_data))
+        )
+
+    @track_db_query
+    async def list_history_tables(self) -> List[str]:
+        """기간별 게임 기록 테이블 목록"""
+        connection = await self._conn()
+        rows = connection.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'game_history_%'")
+        return sorted(row[0] for row in rows if HISTORY_TABLE_PATTERN.match(row[0]))
+
+    @track_db_query
+    async def get_history_chunk(self, table: str, after_id: int, limit: int) -> List[Dict]:
+        """기록 테이블을 id 순으로 나눠 읽기 (보관용)"""
+        if not HISTORY_TABLE_PATTERN.match(table):
+            raise ValueError(f"Not a history table: {table}")
+        connection = await self._conn()
+        rows = connection.execute(f"""
+            SELECT id, room_id, winner_id, pot_amount, game_data, created_at
+            FROM {table} WHERE id > ? ORDER BY id LIMIT ?
+        """, (after_id, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    @track_db_query
+    async def drop_history_table(self, table: str):
+        """보관이 끝난 기록 테이블 삭제"""
+        if not HISTORY_TABLE_PATTERN.match(table):
+            raise ValueError(f"Not a history table: {table}")
+        connection = await self._conn()
+        connection.execute(f"DROP TABLE IF EXISTS {table}")
+        self.history_tables.discard(table)
+
+    @track_db_query
+    async def get_stale_players(self, older_than_seconds: int) -> List[Dict]:
+        """일정 시간 이전에 입장한 플레이어 행 (정리 대상 후보)"""
+        connection = await self._conn()
+        rows = connection.execute("SELECT id, room_id FROM players WHERE created_at < datetime('now', ?)",
+                                  (f"-{int(older_than_seconds)} seconds",)).fetchall()
+        return [dict(row) for row in rows]
+
+    @track_db_query
+    async def delete_players(self, player_ids: list):
+        """플레이어 행 일괄 삭제 및 방 인원 수 갱신"""
+        if not player_ids:
+            return
+        connection = await self._conn()
+        placeholders = ", ".join(["?"] * len(player_ids))
+        room_ids = [row[0] for row in connection.execute(
+            f"SELECT DISTINCT room_id FROM players WHERE id IN ({placeholders})", tuple(player_ids))]
+        connection.execute(f"DELETE FROM players WHERE id IN ({placeholders})", tuple(player_ids))
+        for room_id in room_ids:
+            self._update_player_count(connection, room_id)
+
+    @track_db_query
+    async def get_idle_empty_rooms(self, older_than_seconds: int) -> List[str]:
+        """플레이어가 없고 오래 변경되지 않은 방"""
+        connection = await self._conn()
+        rows = connection.execute("""
+            SELECT r.id FROM game_rooms r
+            LEFT JOIN players p ON r.id = p.room_id
+            WHERE p.id IS NULL AND r.updated_at < datetime('now', ?)
+        """, (f"-{int(older_than_seconds)} seconds",)).fetchall()
+        return [row[0] for row in rows]
+
+    @track_db_query
+    async def delete_rooms(self, room_ids: list):
+        """게임룸 일괄 삭제"""
+        if not room_ids:
+            return
+        connection = await self._conn()
+        placeholders = ", ".join(["?"] * len(room_ids))
+        connection.execute(f"DELETE FROM game_rooms WHERE id IN ({placeholders})", tuple(room_ids))
+
+    @track_db_query
+    async def get_chip_balance(self, account: str) -> Optional[int]:
+        """계정 칩 잔액 조회 (기록이 없으면 None)"""
+        connection = await self._conn()
+        row = connection.execute("SELECT balance FROM chip_balances WHERE account = ?", (account,)).fetchone()
+        return row[0] if row else None
+
+    @track_db_query
+    async def append_ledger_entries(self, entries: list):
+        """칩 원장 일괄 기록 및 잔액/좌석 칩 갱신 (한 트랜잭션)"""
+        if not entries:
+            return
+        connection = await self._conn()
+
+        # 계정별/좌석별 마지막 잔액만 반영
+        balances = {}
+        seat_chips = {}
+        for entry in entries:
+            balances[entry.account] = entry.balance_after
+            if entry.player_id:
+                seat_chips[entry.player_id] = entry.balance_after
+
+        try:
+            connection.execute("BEGIN")
+            connection.executemany(
+                "INSERT INTO chip_ledger (account, player_id, room_id, delta, reason, balance_after) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(e.account, e.player_id, e.room_id, e.delta, e.reason, e.balance_after) for e in entries]
+            )
+            connection.executemany(
+                "INSERT INTO chip_balances (account, balance) VALUES (?, ?) "
+                "ON CONFLICT (account) DO UPDATE SET balance = excluded.balance, updated_at = CURRENT_TIMESTAMP",
+                list(balances.items())
+            )
+            if seat_chips:
+                connection.executemany(
+                    "UPDATE players SET chips = ? WHERE id = ?",
+                    [(chips, player_id) for player_id, chips in seat_chips.items()]
+                )
+            connection.commit()
+        except sqlite3.Error:
+            connection.rollback()
+            raise
+
+    @track_db_query
+    async def get_ledger_balances(self, accounts: list) -> Dict[str, int]:
+        """계정별 원장 합계 (잔액 대조용)"""
+        if not accounts:
+            return {}
+        connection = await self._conn()
+        placeholders = ", ".join(["?"] * len(accounts))
+        rows = connection.execute(
+            f"SELECT account, SUM(delta) FROM chip_ledger WHERE account IN ({placeholders}) GROUP BY account",
+            tuple(accounts)
+        ).fetchall()
+        return {account: int(total) for account, total in rows}
+
+    @track_db_query
+    async def get_all_player_stats(self) -> List[Dict]:
+        """저장된 플레이어 통계 전체 조회 (시작 시 한 번)"""
+        connection = await self._conn()
+        rows = [dict(row) for row in connection.execute(
+            "SELECT account, hands_played, hands_won, biggest_pot, net_chips, hand_types FROM player_stats")]
+        for row in rows:
+            row['hand_types'] = json.loads(row['hand_types']) if row['hand_types'] else {}
+        return rows
+
+    @track_db_query
+    async def save_player_stats(self, stats: List[Dict]):
+        """플레이어 통계 일괄 저장"""
+        if not stats:
+            return
+        connection = await self._conn()
+        connection.executemany("""
+            INSERT INTO player_stats (account, hands_played, hands_won, biggest_pot, net_chips, hand_types)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (account) DO UPDATE SET
+                hands_played = excluded.hands_played,
+                hands_won = excluded.hands_won,
+                biggest_pot = excluded.biggest_pot,
+                net_chips = excluded.net_chips,
+                hand_types = excluded.hand_types,
+                updated_at = CURRENT_TIMESTAMP
+        """, [
+            (s['account'], s['hands_played'], s['hands_won'], s['biggest_pot'], s['net_chips'],
+             json.dumps(s['hand_types'], ensure_ascii=False))
+            for s in stats
+        ])
+
+    async def close(self):
+        """데이터베이스 연결 종료"""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
@@ -0,0 +1,163 @@
+import asyncio
+import bisect
+import os
+from typing import Dict, List, Optional, Tuple
+
+# 통계를 DB 에 체크포인트하는 주기 (초)
+CHECKPOINT_INTERVAL = float(os.getenv('STATS_CHECKPOINT_INTERVAL', '30'))
+# 승률 순위에 들기 위한 최소 판 수
+WIN_RATE_MIN_HANDS = int(os.getenv('WIN_RATE_MIN_HANDS', '20'))
+
+LEADERBOARD_METRICS = ("net_chips", "hands_won", "biggest_pot", "hands_played", "win_rate")
+
+
+class PlayerStats:
+    """플레이어 누적 통계"""
+
+    __slots__ = ("account", "hands_played", "hands_won", "biggest_pot", "net_chips", "hand_types")
+
+    def __init__(self, account: str, hands_played: int = 0, hands_won: int = 0, biggest_pot: int = 0,
+                 net_chips: int = 0, hand_types: Optional[Dict[str, int]] = None):
+        self.account = account
+        self.hands_played = hands_played
+        self.hands_won = hands_won
+        self.biggest_pot = biggest_pot
+        self.net_chips = net_chips
+        self.hand_types: Dict[str, int] = hand_types or {}
+
+    @property
+    def win_rate(self) -> float:
+        return self.hands_won / self.hands_played if self.hands_played else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "account": self.account,
+            "hands_played": self.hands_played,
+            "hands_won": self.hands_won,
+            "win_rate": round(self.win_rate, 4),
+            "biggest_pot": self.biggest_pot,
+            "net_chips": self.net_chips,
+            "hand_types": self.hand_types,
+        }
+
+
+class Leaderboard:
+    """점수 내림차순으로 유지되는 정렬 리스트 (상위 k 조회 O(k))"""
+
+    def __init__(self):
+        self.entries: List[Tuple[float, str]] = []  # (-점수, 계정)
+        self.scores: Dict[str, float] = {}
+
+    def update(self, account: str, score: Optional[float]):
+        """점수 갱신 (None 이면 순위에서 제외)"""
+        old = self.scores.get(account)
+        if old == score:
+            return
+        if old is not None:
+            index = bisect.bisect_left(self.entries, (-old, account))
+            del self.entries[index]
+            del self.scores[account]
+        if score is not None:
+            bisect.insort(self.entries, (-score, account))
+            self.scores[account] = score
+
+    def top(self, k: int) -> List[Tuple[str, float]]:
+        return [(account, -score) for score, account in self.entries[:k]]
+
+    def rank(self, account: str) -> Optional[int]:
+        """1부터 시작하는 순위"""
+        score = self.scores.get(account)
+        if score is None:
+            return None
+        return bisect.bisect_left(self.entries, (-score, account)) + 1
+
+
+class StatsTracker:
+    """end_game 결과로 플레이어 통계와 순위표를 증분 갱신하고 주기적으로 DB 에 저장"""
+
+    def __init__(self, db):
+        self.db = db
+        self.players: Dict[str, PlayerStats] = {}
+        self.leaderboards: Dict[str, Leaderboard] = {metric: Leaderboard() for metric in LEADERBOARD_METRICS}
+        self.dirty: Dict[str, None] = {}
+
+    async def load(self):
+        """시작 시 저장된 통계를 한 번에 불러옴"""
+        for row in await self.db.get_all_player_stats():
+            stats = PlayerStats(
+                row["account"],
+                hands_played=row["hands_played"],
+                hands_won=row["hands_won"],
+                biggest_pot=row["biggest_pot"],
+                net_chips=row["net_chips"],
+                hand_types=row["hand_types"],
+            )
+            self.players[stats.account] = stats
+            self._update_leaderboards(stats)
+
+    def _update_leaderboards(self, stats: PlayerStats):
+        self.leaderboards["net_chips"].update(stats.account, stats.net_chips)
+        self.leaderboards["hands_won"].update(stats.account, stats.hands_won)
+        self.leaderboards["biggest_pot"].update(stats.account, stats.biggest_pot)
+        self.leaderboards["hands_played"].update(stats.account, stats.hands_played)
+        qualified = stats.hands_played >= WIN_RATE_MIN_HANDS
+        self.leaderboards["win_rate"].update(stats.account, stats.win_rate if qualified else None)
+
+    def record_hand(self, results: List[Dict]):
+        """한 판 결과 반영
+
+        results: [{"account", "won", "pot", "contributed", "hand_name"}] - 참가자마다 하나
+        """
+        for result in results:
+            account = result["account"]
+            stats = self.players.get(account)
+            if stats is None:
+                stats = self.players[account] = PlayerStats(account)
+            stats.hands_played += 1
+            stats.net_chips -= result["contributed"]
+            if result["won"]:
+                stats.hands_won += 1
+                stats.net_chips += result["pot"]
+                stats.biggest_pot = max(stats.biggest_pot, result["pot"])
+            hand_name = result.get("hand_name")
+            if hand_name:
+                stats.hand_types[hand_name] = stats.hand_types.get(hand_name, 0) + 1
+            self._update_leaderboards(stats)
+            self.dirty[account] = None
+
+    def get(self, account: str) -> Optional[Dict]:
+        stats = self.players.get(account)
+        if stats is None:
+            return None
+        data = stats.to_dict()
+        data["ranks"] = {metric: board.rank(account) for metric, board in self.leaderboards.items()}
+        return data
+
+    def top(self, metric: str, k: int) -> List[Dict]:
+        """순위표 상위 k 명"""
+        return [
+            {"rank": i + 1, "account": account, "score": score}
+            for i, (account, score) in enumerate(self.leaderboards[metric].top(k))
+        ]
+
+    async def checkpoint(self):
+        """변경된 플레이어 통계만 DB 에 저장"""
+        if not self.dirty:
+            return
+        accounts = list(self.dirty)
+        self.dirty = {}
+        try:
+            await self.db.save_player_stats([self.players[a].to_dict() for a in accounts])
+        except Exception:
+            for account in accounts:
+                self.dirty[account] = None
+            raise
+
+    async def run(self):
+        """주기적 체크포인트 작업"""
+        while True:
+            await asyncio.sleep(CHECKPOINT_INTERVAL)
+            try:
+                await self.checkpoint()
+            except Exception as e:
+                print(f"Stats checkpoint error: {e}")
@@ -0,0 +1,160 @@
+import math
+import os
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import MAX_PLAYERS
+
+# 테이블 최대 인원 (게임룸 최대 인원과 같음)
+MAX_TABLE_SIZE = MAX_PLAYERS
+# 칩이 이 값보다 적으면 탈락 (기본 베팅 금액)
+MIN_CHIPS = int(os.getenv('TOURNAMENT_MIN_CHIPS', '10'))
+# 참가자마다 똑같이 받는 토너먼트 칩 (계정 잔액/원장과 별도)
+STARTING_STACK = int(os.getenv('TOURNAMENT_STARTING_STACK', '1000'))
+# 배정된 자리 예약 유지 시간 (초) - 참가자가 테이블에 접속할 때까지
+SEAT_TTL = float(os.getenv('TOURNAMENT_SEAT_TTL', '600'))
+# 한 판이 끝난 뒤 다음 판 시작까지 대기 시간 (초)
+HAND_DELAY = float(os.getenv('TOURNAMENT_HAND_DELAY', '5'))
+
+
+def seat_players(names: List[str], table_size: int) -> List[List[str]]:
+    """참가자를 최소 테이블 수에 고르게 배정 (테이블 간 인원 차이 최대 1)"""
+    table_count = max(1, math.ceil(len(names) / table_size))
+    tables: List[List[str]] = [[] for _ in range(table_count)]
+    for i, name in enumerate(names):
+        tables[i % table_count].append(name)
+    return tables
+
+
+def rebalance(tables: Dict[str, List[str]], table_size: int,
+              movable: Iterable[str]) -> Tuple[List[Tuple[str, str, str]], List[str]]:
+    """탈락 후 테이블 재배치
+
+    인원이 줄어 더 적은 테이블로 충분하면 인원이 가장 적은 테이블을 닫고, 남은 테이블 간
+    인원 차이가 2 이상이면 많은 곳에서 적은 곳으로 옮긴다. 판이 진행 중인 테이블의
+    플레이어는 옮기지 않으므로 movable(대기 중인 테이블) 에서만 출발한다.
+    tables 를 직접 수정하고 (이동 목록 [(이름, 출발, 도착)], 닫은 테이블 목록) 반환.
+    """
+    movable = set(movable)
+    moves: List[Tuple[str, str, str]] = []
+    closed: List[str] = []
+    total = sum(len(names) for names in tables.values())
+    needed = max(1, math.ceil(total / table_size))
+
+    def move(name: str, source: str, target: str):
+        tables[source].remove(name)
+        tables[target].append(name)
+        moves.append((name, source, target))
+
+    while len(tables) > needed:
+        candidates = [t for t in tables if t in movable]
+        if not candidates:
+            break
+        source = min(candidates, key=lambda t: len(tables[t]))
+        targets = [t for t in tables if t != source]
+        if sum(table_size - len(tables[t]) for t in targets) < len(tables[source]):
+            break
+        for name in list(tables[source]):
+            target = min((t for t in targets if len(tables[t]) < table_size), key=lambda t: len(tables[t]))
+            move(name, source, target)
+        del tables[source]
+        closed.append(source)
+
+    while len(tables) > 1:
+        candidates = [t for t in tables if t in movable and tables[t]]
+        if not candidates:
+            break
+        source = max(candidates, key=lambda t: len(tables[t]))
+        target = min(tables, key=lambda t: len(tables[t]))
+        if len(tables[source]) - len(tables[target]) <= 1:
+            break
+        move(tables[source][-1], source, target)
+
+    return moves, closed
+
+
+class Tournament:
+    """다중 테이블 토너먼트 진행 상태"""
+
+    def __init__(self, name: str, entrants: List[str], table_size: int, created_by: Optional[str] = None,
+                 starting_stack: int = STARTING_STACK):
+        self.id = str(uuid.uuid4())[:8]
+        self.name = name
+        self.entrants = list(entrants)
+        self.table_size = table_size
+        self.created_by = created_by
+        self.starting_stack = starting_stack
+        # 참가자별 토너먼트 칩 (테이블을 옮겨도 유지)
+        self.stacks: Dict[str, int] = {name: starting_stack for name in entrants}
+        self.status = "registering"  # registering, running, finished
+        # 테이블(방 id) -> 앉아 있는 참가자 이름
+        self.tables: Dict[str, List[str]] = {}
+        # 탈락 순서 (먼저 탈락한 사람이 앞)
+        self.busted: List[str] = []
+        self.winner: Optional[str] = None
+
+    def table_of(self, name: str) -> Optional[str]:
+        for room_id, names in self.tables.items():
+            if name in names:
+                return room_id
+        return None
+
+    def bust(self, name: str):
+        """참가자 탈락 처리"""
+        room_id = self.table_of(name)
+        if room_id is None:
+            return
+        self.tables[room_id].remove(name)
+        self.busted.append(name)
+        if not self.tables[room_id]:
+            del self.tables[room_id]
+        remaining = [n for names in self.tables.values() for n in names]
+        if len(remaining) <= 1:
+            self.status = "finished"
+            self.winner = remaining[0] if remaining else name
+
+    def standings(self) -> List[Dict]:
+        """순위 (남은 참가자는 공동 1위, 탈락자는 늦게 탈락할수록 높은 순위)"""
+        remaining = [n for names in self.tables.values() for n in names]
+        result = [{"rank": 1, "name": name, "busted": False} for name in remaining]
+        for i, name in enumerate(reversed(self.busted)):
+            result.append({"rank": len(remaining) + i + 1, "name": name, "busted": True})
+        return result
+
+    def to_dict(self) -> Dict:
+        return {
+            "tournament_id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "table_size": self.table_size,
+            "starting_stack": self.starting_stack,
+            "tables": self.tables,
+            "stacks": self.stacks,
+            "winner": self.winner,
+            "standings": self.standings(),
+        }
+
+
+class TournamentRegistry:
+    """진행 중인 토너먼트와 방 -> 토너먼트 색인"""
+
+    def __init__(self):
+        self.tournaments: Dict[str, Tournament] = {}
+        self.by_room: Dict[str, Tournament] = {}
+
+    def add(self, tournament: Tournament):
+        self.tournaments[tournament.id] = tournament
+        for room_id in tournament.tables:
+            self.by_room[room_id] = tournament
+
+    def get(self, tournament_id: str) -> Optional[Tournament]:
+        return self.tournaments.get(tournament_id)
+
+    def for_room(self, room_id: str) -> Optional[Tournament]:
+        return self.by_room.get(room_id)
+
+    def close_table(self, room_id: str):
+        self.by_room.pop(room_id, None)
+
+
+tournaments = TournamentRegistry()
@@ -0,0 +1,144 @@
+import asyncio
+import functools
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Dict, List, Optional
+
+# STALL_WATCHDOG_ENABLED=1 일 때만 동작 (기본 비활성화)
+ENABLED = os.getenv('STALL_WATCHDOG_ENABLED', '0') == '1'
+THRESHOLD_MS = float(os.getenv('STALL_THRESHOLD_MS', '100'))
+MAX_STALLS = int(os.getenv('STALL_HISTORY_SIZE', '50'))
+MAX_SLOW_HANDLERS = int(os.getenv('SLOW_HANDLER_HISTORY_SIZE', '20'))
+
+
+class StallWatchdog:
+    """이벤트 루프 블로킹 감지기
+
+    루프 안의 하트비트 태스크가 주기적으로 시각을 기록하고, 별도 스레드가
+    하트비트가 임계값 이상 멈췄는지 확인한다. 멈춘 경우 루프 스레드의 스택과
+    실행 중인 태스크를 캡처해 링 버퍼에 보관한다.
+    """
+
+    def __init__(self, threshold_ms: float = THRESHOLD_MS, max_stalls: int = MAX_STALLS,
+                 max_slow_handlers: int = MAX_SLOW_HANDLERS):
+        self.threshold = threshold_ms / 1000
+        self.interval = self.threshold / 4
+        self.stalls: deque = deque(maxlen=max_stalls)
+        self.max_slow_handlers = max_slow_handlers
+        # (소요 시간, 순번, 기록) 최소 힙 - 가장 느린 N개만 유지
+        self.slow_handlers: List[tuple] = []
+        self._sequence = itertools.count()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.loop_thread_id: Optional[int] = None
+        self.last_beat = time.monotonic()
+        self.current_stall: Optional[Dict] = None
+        self.lock = threading.Lock()
+        self.running = False
+
+    def start(self):
+        """현재 이벤트 루프에서 감시 시작"""
+        if self.running:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self.last_beat = time.monotonic()
+        self.running = True
+        self.loop.create_task(self._heartbeat())
+        threading.Thread(target=self._watch, name="stall-watchdog", daemon=True).start()
+
+    def stop(self):
+        """감시 중지"""
+        self.running = False
+
+    async def _heartbeat(self):
+        """루프가 살아있음을 주기적으로 기록"""
+        while self.running:
+            now = time.monotonic()
+            with self.lock:
+                if self.current_stall is not None:
+                    # 블로킹이 끝났으므로 전체 지속 시간 확정
+                    self.current_stall["duration_ms"] = round((now - self.last_beat) * 1000, 1)
+                    self.current_stall = None
+                self.last_beat = now
+            await asyncio.sleep(self.interval)
+
+    def _watch(self):
+        """하트비트 지연 감시 (별도 스레드)"""
+        while self.running:
+            time.sleep(self.interval)
+            with self.lock:
+                blocked = time.monotonic() - self.last_beat
+                if self.current_stall is None and blocked > self.threshold + self.interval:
+                    self.current_stall = self._capture(blocked)
+                    self.stalls.append(self.current_stall)
+
+    def _capture(self, blocked: float) -> Dict:
+        """루프 스레드의 현재 스택과 태스크 캡처"""
+        frame = sys._current_frames().get(self.loop_thread_id)
+        stack = traceback.format_stack(frame) if frame else []
+        task_name = None
+        coroutine = None
+        try:
+            task = asyncio.current_task(self.loop)
+            if task is not None:
+                task_name = task.get_name()
+                coroutine = task.get_coro().__qualname__
+        except RuntimeError:
+            pass
+        return {
+            "detected_at": time.time(),
+            "blocked_ms": round(blocked * 1000, 1),
+            "duration_ms": None,
+            "task": task_name,
+            "coroutine": coroutine,
+            "stack": [line.rstrip() for line in stack],
+        }
+
+    def record_handler(self, room_id: str, message_type: Optional[str], duration: float):
+        """handle_message 소요 시간 기록 (가장 느린 N개 유지)"""
+        entry = (duration, next(self._sequence), {
+            "room_id": room_id,
+            "message_type": message_type,
+            "duration_ms": round(duration * 1000, 3),
+            "at": time.time(),
+        })
+        if len(self.slow_handlers) < self.max_slow_handlers:
+            heapq.heappush(self.slow_handlers, entry)
+        elif duration > self.slow_handlers[0][0]:
+            heapq.heapreplace(self.slow_handlers, entry)
+
+    def snapshot(self) -> Dict:
+        """관리자 엔드포인트용 현재 상태"""
+        with self.lock:
+            stalls = list(self.stalls)
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "stalls": stalls,
+            "slow_handlers": [entry for _, _, entry in sorted(self.slow_handlers, reverse=True)],
+        }
+
+
+watchdog = StallWatchdog()
+
+
+def trace_handler(func):
+    """handle_message(room_id, player_id, data) 소요 시간 기록 데코레이터"""
+    if not ENABLED:
+        return func
+
+    @functools.wraps(func)
+    async def wrapper(room_id: str, player_id: str, data: dict, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(room_id, player_id, data, *args, **kwargs)
+        finally:
+            message_type = data.get("type") if isinstance(data, dict) else None
+            watchdog.record_handler(room_id, message_type, time.perf_counter() - start)
+
+    return wrapper
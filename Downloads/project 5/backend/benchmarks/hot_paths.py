@@ -0,0 +1,145 @@
+"""게임 로직/모델 핫패스 마이크로 벤치마크
+
+backend 디렉터리에서 실행:
+    python -m benchmarks.hot_paths                      # 결과 출력
+    python -m benchmarks.hot_paths --save base.json     # 베이스라인 저장
+    python -m benchmarks.hot_paths --compare base.json  # 베이스라인과 비교
+"""
+import argparse
+import json
+import platform
+import sys
+import timeit
+from typing import Callable, Dict, List
+
+from app.dealer import Dealer
+from app.game_logic import SeotdaGame
+from app.protocol import diff_game_state
+from app.models import Card, GameRoom, Player
+from app.main import build_game_state
+
+# 비교 시 이 비율 이상 느려지면 회귀로 판단
+DEFAULT_THRESHOLD = 0.10
+
+
+def make_room(player_count: int = 4) -> GameRoom:
+    """벤치마크용 게임룸 생성 (WebSocket 없음)"""
+    room = GameRoom(room_id="bench")
+    for i in range(player_count):
+        room.add_player(Player(id=f"p{i}", name=f"player{i}", websocket=None))
+    room.start_game()
+    for i, player in enumerate(room.players):
+        player.current_bet = 10 * (i + 1)
+    return room
+
+
+def build_cases() -> Dict[str, Callable[[], object]]:
+    """벤치마크 대상 함수 목록"""
+    game = SeotdaGame()
+    ttaeng = [Card(suit="maple", number=10), Card(suit="maple", number=10)]
+    special = [Card(suit="pine", number=1), Card(suit="iris", number=4)]
+    kkeut = [Card(suit="plum", number=3), Card(suit="bush", number=5)]
+    room = make_room()
+    state_before = build_game_state(room)
+    room.current_pot += 20
+    room.players[1].current_bet += 20
+    room.next_turn()
+    state_after = build_game_state(room)
+    seeded_dealer = Dealer(mode="seeded", base_seed="0", pool_size=0)
+    secure_dealer = Dealer(mode="secure", pool_size=0)
+
+    def deal_cards():
+        # 덱이 비면 deal_cards가 새 덱을 만들기 때문에 매번 새로 채움
+        game.deck = game.create_deck()
+        return game.deal_cards()
+
+    return {
+        "create_deck": game.create_deck,
+        "shuffle_deck": game.shuffle_deck,
+        "deal_cards": deal_cards,
+        "seotda_game_init": SeotdaGame,
+        "dealer.deal.seeded": lambda: seeded_dealer.deal(4),
+        "dealer.deal.secure": lambda: secure_dealer.deal(4),
+        "get_hand_value.ttaeng": lambda: game.get_hand_value(ttaeng),
+        "get_hand_value.special": lambda: game.get_hand_value(special),
+        "get_hand_value.kkeut": lambda: game.get_hand_value(kkeut),
+        "get_hand_name.ttaeng": lambda: game.get_hand_name(ttaeng),
+        "get_hand_name.kkeut": lambda: game.get_hand_name(kkeut),
+        "next_turn": room.next_turn,
+        "is_betting_complete": room.is_betting_complete,
+        "to_dict": room.to_dict,
+        "build_game_state": lambda: build_game_state(room),
+        "build_game_state.json": lambda: json.dumps(build_game_state(room)),
+        "diff_game_state": lambda: diff_game_state(state_before, state_after),
+        "diff_game_state.json": lambda: json.dumps(diff_game_state(state_before, state_after)),
+    }
+
+
+def run(number: int, repeat: int, only: List[str] = None) -> Dict:
+    """벤치마크 실행 (호출당 최소 시간, ns 단위)"""
+    results = {}
+    for name, func in build_cases().items():
+        if only and not any(name.startswith(prefix) for prefix in only):
+            continue
+        timings = timeit.repeat(func, number=number, repeat=repeat)
+        per_call = [t / number * 1e9 for t in timings]
+        results[name] = {
+            "min_ns": round(min(per_call), 1),
+            "mean_ns": round(sum(per_call) / len(per_call), 1),
+            "number": number,
+            "repeat": repeat,
+        }
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> bool:
+    """베이스라인과 비교 후 회귀 여부 반환"""
+    regressed = False
+    print(f"{'benchmark':<26} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            print(f"{name:<26} {'-':>12} {result['min_ns']:>10.1f}ns {'new':>9}")
+            continue
+        change = (result["min_ns"] - base["min_ns"]) / base["min_ns"]
+        mark = ""
+        if change > threshold:
+            mark = "  <- 느려짐"
+            regressed = True
+        print(f"{name:<26} {base['min_ns']:>10.1f}ns {result['min_ns']:>10.1f}ns {change:>+8.1%}{mark}")
+    return regressed
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="섯다 핫패스 마이크로 벤치마크")
+    parser.add_argument("--number", type=int, default=10000, help="반복당 호출 횟수")
+    parser.add_argument("--repeat", type=int, default=5, help="반복 횟수")
+    parser.add_argument("--only", nargs="*", help="이름이 이 접두사로 시작하는 벤치마크만 실행")
+    parser.add_argument("--save", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--compare", help="비교할 베이스라인 JSON 파일")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="회귀로 판단할 느려짐 비율 (기본 0.10)")
+    args = parser.parse_args(argv)
+
+    current = run(args.number, args.repeat, args.only)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        return 1 if compare(current, baseline, args.threshold) else 0
+
+    json.dump(current, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
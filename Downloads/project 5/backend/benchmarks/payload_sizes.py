@@ -0,0 +1,80 @@
+"""JSON / compact 프로토콜 메시지 크기 및 인코딩 시간 비교
+
+backend 디렉터리에서 실행:
+    python -m benchmarks.payload_sizes
+"""
+import json
+import sys
+import timeit
+from typing import Dict
+
+from app import protocol
+from app.dealer import Dealer
+from app.main import build_game_state
+
+from .hot_paths import make_room
+
+
+def build_messages(player_count: int) -> Dict[str, Dict]:
+    """플레이어 수별 대표 메시지"""
+    room = make_room(player_count)
+    for i, player in enumerate(room.players):
+        player.name = f"플레이어{i}"
+        player.id = f"{i:08x}"
+    room.current_player = room.players[0].id
+    dealt = Dealer(mode="seeded", base_seed="1", pool_size=0).deal(player_count)
+    for player, cards in zip(room.players, dealt.hands):
+        player.cards = cards
+    room.hand_seed = dealt.seed
+    cards = [{"suit": c.suit, "number": c.number} for c in dealt.hands[0]]
+    return {
+        "game_state": build_game_state(room),
+        "cards_dealt": {"type": "cards_dealt", "cards": cards},
+        "game_result": {
+            "type": "game_result",
+            "winner": {"id": room.players[0].id, "name": room.players[0].name, "cards": cards},
+            "all_players": [
+                {
+                    "id": p.id,
+                    "name": p.name,
+                    "cards": [{"suit": c.suit, "number": c.number} for c in p.cards],
+                    "folded": p.folded,
+                } for p in room.players
+            ],
+            "hand_seed": room.hand_seed,
+        },
+        "bet (client)": {"type": "bet", "action": "call", "amount": 0},
+    }
+
+
+def measure(number: int = 20000) -> Dict:
+    """메시지별 크기(바이트)와 인코딩 시간(ns)"""
+    results = {}
+    for player_count in (2, 4):
+        for name, message in build_messages(player_count).items():
+            json_size = len(protocol.encode_json(message).encode())
+            encode = protocol.encode_client if name == "bet (client)" else protocol.encode_compact
+            compact = encode(message)
+            compact_ns = round(min(timeit.repeat(
+                lambda: encode(message), number=number, repeat=3)) / number * 1e9, 1)
+            json_ns = round(min(timeit.repeat(
+                lambda: protocol.encode_json(message), number=number, repeat=3)) / number * 1e9, 1)
+            results[f"{name}.{player_count}p"] = {
+                "json_bytes": json_size,
+                "compact_bytes": len(compact),
+                "ratio": round(len(compact) / json_size, 3),
+                "json_encode_ns": json_ns,
+                "compact_encode_ns": compact_ns,
+            }
+    return results
+
+
+def main() -> int:
+    results = measure()
+    json.dump(results, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""저장소 백엔드별 Database 호출 지연 시간 측정
+
+backend 디렉터리에서 실행 (DB_BACKEND / DB_* / SQLITE_PATH 설정을 따름):
+    DB_BACKEND=sqlite SQLITE_PATH=/tmp/bench.db python -m benchmarks.storage_ops
+    DB_BACKEND=mysql python -m benchmarks.storage_ops
+"""
+import asyncio
+import json
+import sys
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List
+
+from app.database import DB_BACKEND, create_database
+from app.ledger import LedgerEntry
+
+
+async def timed(call: Callable[[], Awaitable], number: int) -> Dict[str, float]:
+    """호출당 지연 시간 (마이크로초) 중앙값/p99"""
+    samples: List[float] = []
+    for _ in range(number):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return {
+        "p50_us": round(samples[len(samples) // 2], 1),
+        "p99_us": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 1),
+    }
+
+
+async def measure(number: int = 500) -> Dict:
+    db = create_database()
+    await db.init_database()
+    prefix = uuid.uuid4().hex[:6]
+    room_id = f"bench-{prefix}"
+    await db.create_room({"id": room_id, "name": "bench", "created_by": "bench"})
+    counter = iter(range(10 ** 9))
+
+    async def join_leave():
+        player_id = f"{prefix}{next(counter)}"
+        await db.add_player_to_room(room_id, player_id, "bench")
+        await db.remove_player_from_room(room_id, player_id)
+
+    async def ledger_batch():
+        await db.append_ledger_entries([
+            LedgerEntry(f"bench-{prefix}-{i}", None, room_id, 1, "call", i, time.time()) for i in range(20)
+        ])
+
+    cases = {
+        "get_all_rooms": db.get_all_rooms,
+        "get_room_by_id": lambda: db.get_room_by_id(room_id),
+        "add+remove_player": join_leave,
+        "save_game_state": lambda: db.save_game_state(
+            room_id, {"status": "playing", "current_pot": 100, "current_bet": 10}),
+        "save_game_result": lambda: db.save_game_result(room_id, "p0", 100, {"players": []}),
+        "append_ledger_entries(20)": ledger_batch,
+    }
+    try:
+        results = {name: await timed(call, number) for name, call in cases.items()}
+    finally:
+        await db.delete_room(room_id)
+        await db.close()
+    return {"backend": DB_BACKEND, "number": number, "results": results}
+
+
+def main() -> int:
+    json.dump(asyncio.run(measure()), sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
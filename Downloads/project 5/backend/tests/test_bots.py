@@ -0,0 +1,59 @@
+"""봇 결정 일괄 처리 테스트"""
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+
+from app import bots
+from app.bots import BotDriver
+from app.dealer import DECK
+from app.models import GameRoom, Player
+
+
+class DeadPool:
+    """spawn 직후 워커가 죽는 풀 (모든 제출이 BrokenProcessPool)"""
+    created = 0
+
+    def __init__(self, *args, **kwargs):
+        DeadPool.created += 1
+
+    def submit(self, *args, **kwargs):
+        raise BrokenProcessPool("worker died on spawn")
+
+    def shutdown(self, *args, **kwargs):
+        pass
+
+
+def test_broken_pool_falls_back_to_threads(monkeypatch):
+    monkeypatch.setattr(bots, "ProcessPoolExecutor", DeadPool)
+    monkeypatch.setattr(bots, "BOT_WORKERS", 2)
+    monkeypatch.setattr(bots, "POOL_RETRIES", 2)
+    monkeypatch.setattr(bots, "POOL_BACKOFF", 0)
+    monkeypatch.setattr(bots, "BATCH_WINDOW", 0)
+
+    room = GameRoom("room")
+    bot = Player(id="bot", name="봇", websocket=None)
+    bot.is_bot = True
+    bot.cards = DECK[:2]
+    room.add_player(bot)
+    room.add_player(Player(id="human", name="alice", websocket=None))
+    room.start_game()
+
+    async def scenario():
+        decided = asyncio.Event()
+        results = []
+
+        async def apply(room_id, bot_id, hand_number, action, amount):
+            results.append((room_id, bot_id, hand_number, action))
+            decided.set()
+
+        driver = BotDriver(apply)
+        driver.start()
+        driver.request(room, bot)
+        await asyncio.wait_for(decided.wait(), timeout=10)
+        driver.stop()
+        return driver, results
+
+    driver, results = asyncio.run(scenario())
+    # 처음 풀 + 재시도 2번 뒤 스레드 풀로 전환해 결정
+    assert DeadPool.created == 3
+    assert driver.workers == 0 and driver.executor is None
+    assert [r[:3] for r in results] == [("room", "bot", room.hand_number)]
@@ -0,0 +1,239 @@
+"""게임 진행 테스트 (WebSocket 없이 app.main 의 처리 함수를 직접 호출, SQLite 저장소 사용)"""
+import asyncio
+import uuid
+
+import pytest
+from fastapi import HTTPException
+
+from app import admission, main
+from app.ledger import ChipLedger
+from app.matchmaking import SeatIndex
+from app.models import GameRoom, Player
+from app.sqlite_database import SQLiteDatabase
+from app.stats import StatsTracker
+from app.tournament import TournamentRegistry
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    database = SQLiteDatabase(str(tmp_path / "seotda.db"))
+    run(database.init_database())
+    monkeypatch.setattr(main, "db", database)
+    monkeypatch.setattr(main, "ledger", ChipLedger(database))
+    monkeypatch.setattr(main, "stats", StatsTracker(database))
+    monkeypatch.setattr(main, "game_rooms", {})
+    monkeypatch.setattr(main, "seat_index", SeatIndex())
+    monkeypatch.setattr(main, "tournaments", TournamentRegistry())
+    yield database
+    run(database.close())
+
+
+def new_id() -> str:
+    return str(uuid.uuid4())[:8]
+
+
+async def open_room(db, names, max_players=4) -> GameRoom:
+    """DB 와 메모리에 방을 만들고 WebSocket 없는 플레이어를 원장 잔액으로 앉힘"""
+    room_id = new_id()
+    await db.create_room({
+        "id": room_id, "name": "테스트방", "description": "", "max_players": max_players,
+        "is_private": False, "password": None, "created_by": names[0],
+    })
+    main.seat_index.register(await db.get_room_by_id(room_id))
+    room = main.game_rooms[room_id] = GameRoom(room_id)
+    for name in names:
+        player = Player(id=new_id(), name=name, websocket=None)
+        main.seat_index.claim(room_id)
+        player.chips = await main.ledger.load(name)
+        room.add_player(player)
+        await db.add_player_to_room(room_id, player.id, name)
+    return room
+
+
+def test_raise_rejects_non_positive_amounts(db):
+    async def scenario():
+        room = await open_room(db, ["alice", "bob"])
+        await main.start_game(room.room_id)
+        alice = room.players[0]
+        balance = main.ledger.balance("alice")
+
+        for amount in (-5000, 0, "100", 2.5, True):
+            await main.handle_bet(room.room_id, alice.id, "raise", amount)
+            assert main.ledger.balance("alice") == balance
+            assert (room.current_pot, room.current_bet) == (0, 10)
+            assert room.current_player == alice.id
+
+        await main.handle_bet(room.room_id, alice.id, "raise", 20)
+        assert main.ledger.balance("alice") == balance - 30
+        assert (room.current_pot, room.current_bet) == (30, 30)
+        assert all(entry.delta <= 0 for entry in main.ledger.pending if entry.reason != "initial")
+
+    run(scenario())
+
+
+def test_leaving_on_own_turn_passes_the_turn(db):
+    async def scenario():
+        room = await open_room(db, ["alice", "bob", "carol"])
+        await main.start_game(room.room_id)
+        alice, bob, carol = room.players
+
+        await main.remove_player(room.room_id, alice.id)
+        assert room.status == "playing"
+        assert room.current_player == bob.id
+
+        await main.handle_bet(room.room_id, bob.id, "call", 0)
+        assert room.current_player == carol.id
+
+    run(scenario())
+
+
+def test_leaving_with_one_opponent_ends_the_hand(db):
+    async def scenario():
+        room = await open_room(db, ["alice", "bob"])
+        await main.start_game(room.room_id)
+        alice, bob = room.players
+        await main.handle_bet(room.room_id, alice.id, "call", 0)
+        assert room.current_player == bob.id
+        balance = main.ledger.balance("alice")
+
+        await main.remove_player(room.room_id, bob.id)
+        assert room.status == "waiting"
+        assert room.current_player is None
+        assert main.ledger.balance("alice") == balance + 10
+        assert (await db.get_room_by_id(room.room_id))["status"] == "waiting"
+
+        # 다시 판을 시작할 수 있어야 함
+        carol = Player(id=new_id(), name="carol", websocket=None)
+        carol.chips = await main.ledger.load("carol")
+        room.add_player(carol)
+        await main.handle_message(room.room_id, alice.id, {"type": "start_game"})
+        assert room.status == "playing"
+
+    run(scenario())
+
+
+def test_warm_up_drops_seats_left_by_previous_process(db):
+    async def scenario():
+        room = await open_room(db, ["alice", "bob"], max_players=2)
+        await main.start_game(room.room_id)
+
+        # 재시작: 메모리 상태는 사라지고 DB 행만 남음
+        main.game_rooms.clear()
+        main.seat_index.remove_room(room.room_id)
+        assert await main.warm_up_rooms() == 1
+
+        assert main.seat_index.rooms[room.room_id].seated == 0
+        assert main.seat_index.find() == room.room_id
+        data = await db.get_room_by_id(room.room_id)
+        assert (data["status"], data["current_players"]) == ("waiting", 0)
+
+    run(scenario())
+
+
+def test_add_bots_is_shed_under_overload(db, monkeypatch):
+    async def scenario():
+        room = await open_room(db, ["alice"])
+        monkeypatch.setattr(admission.shedder, "level", admission.SHED_LOBBY)
+        with pytest.raises(HTTPException) as error:
+            await main.add_bots(room.room_id, main.AddBotsRequest())
+        assert error.value.status_code == 503
+        assert len(room.players) == 1
+
+        monkeypatch.setattr(admission.shedder, "level", admission.NORMAL)
+        added = await main.add_bots(room.room_id, main.AddBotsRequest(count=1))
+        assert len(added["bots"]) == 1 and room.players[1].is_bot
+
+    run(scenario())
+
+
+async def open_tournament(db, names, table_size, starting_stack=1000):
+    """토너먼트를 만들고 참가자를 배정된 테이블에 예약 토큰으로 앉힘"""
+    created = await main.create_tournament(main.CreateTournamentRequest(
+        name="대회", players=names, table_size=table_size, starting_stack=starting_stack))
+    tour = main.tournaments.get(created["tournament_id"])
+    seated = {}
+    for name, seat in created["seats"].items():
+        assert main.seat_index.claim(seat["room_id"], seat["reservation"])
+        player = Player(id=new_id(), name=name, websocket=None)
+        player.uses_ledger = False
+        player.chips = tour.stacks[name]
+        main.game_rooms[seat["room_id"]].add_player(player)
+        await db.add_player_to_room(seat["room_id"], player.id, name)
+        seated[name] = player
+    tour.status = "running"
+    return tour, seated
+
+
+def record_messages(monkeypatch):
+    sent = []
+
+    async def send_to_player(player, message):
+        sent.append((player.name, message))
+
+    monkeypatch.setattr(main, "send_to_player", send_to_player)
+    return sent
+
+
+def test_bust_rebalances_and_closes_the_table(db, monkeypatch):
+    sent = record_messages(monkeypatch)
+    monkeypatch.setattr(main.hand_evaluator, "determine_winner",
+                        lambda players: next(p for p in players if p.name == "c"))
+
+    async def scenario():
+        # a, c 는 첫 테이블, b, d 는 둘째 테이블
+        tour, seated = await open_tournament(db, ["a", "b", "c", "d"], table_size=3)
+        first, second = list(tour.tables)
+        assert tour.tables[first] == ["a", "c"]
+        tour.stacks["a"] = seated["a"].chips = 10
+
+        room = main.game_rooms[first]
+        await main.start_game(first)
+        await main.handle_bet(first, seated["a"].id, "call", 0)
+        await main.handle_bet(first, seated["c"].id, "call", 0)
+
+        # a 는 탈락, 세 명이면 한 테이블로 충분하므로 c 를 둘째 테이블로 옮기고 첫 테이블을 닫음
+        assert tour.busted == ["a"]
+        assert tour.tables == {second: ["b", "d", "c"]}
+        assert tour.stacks == {"a": 0, "b": 1000, "c": 1010, "d": 1000}
+        assert main.tournaments.for_room(first) is None
+        assert main.tournaments.for_room(second) is tour
+        assert first not in main.game_rooms and not room.players
+
+        busted = [m for name, m in sent if name == "a" and m["type"] == "tournament_busted"]
+        assert busted and busted[0]["rank"] == 4
+        moved = [m for name, m in sent if name == "c" and m["type"] == "table_change"]
+        assert len(moved) == 1 and moved[0]["room_id"] == second
+        assert moved[0]["reservation"] in main.seat_index.rooms[second].reservations
+
+        # 토너먼트 칩은 계정 원장과 별도
+        assert main.ledger.pending == []
+
+    run(scenario())
+
+
+def test_bust_that_empties_a_table_unmaps_it(db, monkeypatch):
+    record_messages(monkeypatch)
+    monkeypatch.setattr(main.tournament, "MIN_CHIPS", 100)
+
+    async def scenario():
+        tour, seated = await open_tournament(db, ["a", "b", "c", "d"], table_size=2, starting_stack=100)
+        first, second = list(tour.tables)
+        for name in tour.tables[first]:
+            tour.stacks[name] = seated[name].chips = 20
+
+        await main.start_game(first)
+        for name in ["a", "c"]:
+            await main.handle_bet(first, seated[name].id, "all_in", 0)
+
+        # 둘 다 최소 칩보다 적어 탈락 -> 빈 테이블은 토너먼트 색인에서 제거
+        assert sorted(tour.busted) == ["a", "c"]
+        assert tour.status == "running"
+        assert list(tour.tables) == [second]
+        assert main.tournaments.for_room(first) is None
+        assert first not in main.game_rooms
+
+    run(scenario())
@@ -0,0 +1,239 @@
+"""저장소 백엔드 공통 테스트 (SQLite / MySQL 에 같은 테스트를 실행)
+
+MySQL 은 DB_HOST:DB_PORT 에 연결할 수 없으면 건너뛴다. 테스트용 데이터베이스 이름은
+TEST_DB_NAME (기본 seotda_test) 이며 운영 DB_NAME 은 사용하지 않는다.
+"""
+import asyncio
+import json
+import os
+import socket
+import time
+import uuid
+
+import pytest
+
+from app.database import MySQLDatabase, history_table_name
+from app.ledger import LedgerEntry
+from app.sqlite_database import SQLiteDatabase
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def mysql_reachable(host: str, port: int) -> bool:
+    try:
+        with socket.create_connection((host, port), timeout=1):
+            return True
+    except OSError:
+        return False
+
+
+@pytest.fixture(params=["sqlite", "mysql"])
+def db(request, tmp_path):
+    if request.param == "sqlite":
+        database = SQLiteDatabase(str(tmp_path / "seotda.db"))
+    else:
+        database = MySQLDatabase()
+        if not mysql_reachable(database.host, database.port):
+            pytest.skip(f"MySQL not reachable at {database.host}:{database.port}")
+        database.database = os.getenv('TEST_DB_NAME', 'seotda_test')
+    run(database.init_database())
+    if database.schema_error:
+        pytest.skip(f"schema setup failed: {database.schema_error}")
+    yield database
+    run(database.close())
+
+
+def new_id() -> str:
+    return str(uuid.uuid4())[:8]
+
+
+def room_data(room_id: str, **overrides) -> dict:
+    data = {
+        "id": room_id,
+        "name": "테스트방",
+        "description": "",
+        "max_players": 4,
+        "is_private": False,
+        "password": None,
+        "created_by": "tester",
+    }
+    data.update(overrides)
+    return data
+
+
+def decode(game_data):
+    return json.loads(game_data) if isinstance(game_data, (str, bytes)) else game_data
+
+
+def test_room_lifecycle(db):
+    room_id = new_id()
+    run(db.create_room(room_data(room_id)))
+
+    room = run(db.get_room_by_id(room_id))
+    assert room["name"] == "테스트방"
+    assert room["max_players"] == 4
+    assert not room["is_private"]
+    assert room["status"] == "waiting"
+    assert room["current_players"] == 0
+
+    run(db.update_room(room_id, {"name": "바뀐방", "max_players": 3}))
+    run(db.update_room_status(room_id, "playing"))
+    room = run(db.get_room_by_id(room_id))
+    assert (room["name"], room["max_players"], room["status"]) == ("바뀐방", 3, "playing")
+
+    player_id = new_id()
+    run(db.add_player_to_room(room_id, player_id, "alice"))
+    assert run(db.get_room_by_id(room_id))["current_players"] == 1
+    assert [p["id"] for p in run(db.get_room_players(room_id))] == [player_id]
+
+    run(db.delete_room(room_id))
+    assert run(db.get_room_by_id(room_id)) is None
+    assert run(db.get_room_players(room_id)) == []
+
+
+def test_create_rooms_batch(db):
+    room_ids = [new_id() for _ in range(3)]
+    run(db.create_rooms([room_data(room_id, is_private=True) for room_id in room_ids]))
+
+    listed = {room["id"] for room in run(db.get_all_rooms())}
+    assert set(room_ids) <= listed
+    assert all(run(db.get_room_by_id(room_id))["is_private"] for room_id in room_ids)
+
+    run(db.delete_rooms(room_ids))
+    assert all(run(db.get_room_by_id(room_id)) is None for room_id in room_ids)
+
+
+def test_game_history(db):
+    room_id = new_id()
+    run(db.create_room(room_data(room_id)))
+    for pot in (20, 40, 60):
+        run(db.save_game_result(room_id, "winner", pot, {"hand_seed": pot, "players": []}))
+
+    table = history_table_name()
+    assert table in run(db.list_history_tables())
+
+    rows = []
+    last_id = 0
+    while True:
+        chunk = run(db.get_history_chunk(table, last_id, 2))
+        if not chunk:
+            break
+        assert len(chunk) <= 2
+        rows.extend(chunk)
+        last_id = chunk[-1]["id"]
+    ours = [row for row in rows if row["room_id"] == room_id]
+    assert [row["pot_amount"] for row in ours] == [20, 40, 60]
+    assert [decode(row["game_data"])["hand_seed"] for row in ours] == [20, 40, 60]
+
+    with pytest.raises(ValueError):
+        run(db.get_history_chunk("game_rooms", 0, 1))
+
+    run(db.delete_room(room_id))
+
+
+def test_chip_ledger(db):
+    account = f"acct-{new_id()}"
+    assert run(db.get_chip_balance(account)) is None
+
+    room_id = new_id()
+    player_id = new_id()
+    run(db.create_room(room_data(room_id)))
+    run(db.add_player_to_room(room_id, player_id, account))
+
+    now = time.time()
+    run(db.append_ledger_entries([
+        LedgerEntry(account, None, None, 1000, "initial", 1000, now),
+        LedgerEntry(account, player_id, room_id, -10, "call", 990, now),
+        LedgerEntry(account, player_id, room_id, 30, "payout", 1020, now),
+    ]))
+
+    assert run(db.get_chip_balance(account)) == 1020
+    assert run(db.get_ledger_balances([account])) == {account: 1020}
+    assert run(db.get_room_players(room_id))[0]["chips"] == 1020
+
+    run(db.delete_room(room_id))
+
+
+def test_live_rooms_and_interrupted_games(db):
+    room_ids = [new_id() for _ in range(2)]
+    run(db.create_rooms([room_data(room_id) for room_id in room_ids]))
+    run(db.add_player_to_room(room_ids[0], new_id(), "alice"))
+    run(db.add_player_to_room(room_ids[0], new_id(), "bob"))
+    run(db.update_room_status(room_ids[0], "playing"))
+
+    live = {room["id"]: room for room in run(db.get_live_rooms())}
+    assert set(room_ids) <= set(live)
+    assert [live[room_id]["current_players"] for room_id in room_ids] == [2, 0]
+    assert live[room_ids[0]]["status"] == "playing"
+    assert live[room_ids[1]]["max_players"] == 4
+
+    assert run(db.reset_interrupted_games()) >= 1
+    assert run(db.get_room_by_id(room_ids[0]))["status"] == "waiting"
+    assert run(db.reset_interrupted_games()) == 0
+
+    assert run(db.clear_players()) >= 2
+    assert run(db.get_room_players(room_ids[0])) == []
+    live = {room["id"]: room for room in run(db.get_live_rooms())}
+    assert live[room_ids[0]]["current_players"] == 0
+
+    run(db.delete_rooms(room_ids))
+
+
+def test_orphan_sweeps(db):
+    busy_room, idle_room = new_id(), new_id()
+    run(db.create_rooms([room_data(busy_room), room_data(idle_room)]))
+    orphans = [new_id(), new_id()]
+    for player_id in orphans:
+        run(db.add_player_to_room(busy_room, player_id, f"p-{player_id}"))
+
+    # 기준 시간 안에 들어온 행은 대상이 아님
+    assert not {row["id"] for row in run(db.get_stale_players(3600))} & set(orphans)
+    assert busy_room not in run(db.get_idle_empty_rooms(0))
+
+    time.sleep(1.1)
+    stale = [row for row in run(db.get_stale_players(0)) if row["id"] in orphans]
+    assert sorted(row["id"] for row in stale) == sorted(orphans)
+    assert {row["room_id"] for row in stale} == {busy_room}
+    assert idle_room in run(db.get_idle_empty_rooms(0))
+    assert idle_room not in run(db.get_idle_empty_rooms(3600))
+
+    run(db.delete_players(orphans))
+    assert run(db.get_room_players(busy_room)) == []
+    assert run(db.get_room_by_id(busy_room))["current_players"] == 0
+
+    run(db.delete_rooms([busy_room, idle_room]))
+    assert run(db.get_room_by_id(idle_room)) is None
+
+
+def test_player_stats(db):
+    account = f"acct-{new_id()}"
+    row = {"account": account, "hands_played": 3, "hands_won": 1, "biggest_pot": 40,
+           "net_chips": -10, "hand_types": {"38광땡": 1}}
+    run(db.save_player_stats([row]))
+    saved = {r["account"]: r for r in run(db.get_all_player_stats())}
+    assert saved[account] == row
+
+    # 같은 계정은 덮어씀
+    row = dict(row, hands_played=4, hands_won=2, biggest_pot=80, net_chips=30, hand_types={"38광땡": 1, "9끗": 1})
+    run(db.save_player_stats([row]))
+    saved = [r for r in run(db.get_all_player_stats()) if r["account"] == account]
+    assert saved == [row]
+
+
+def test_history_tables(db):
+    table = history_table_name()
+    room_id = new_id()
+    run(db.save_game_result(room_id, "winner", 10, {"players": []}))
+    assert table in run(db.list_history_tables())
+
+    run(db.drop_history_table(table))
+    assert table not in run(db.list_history_tables())
+    with pytest.raises(ValueError):
+        run(db.drop_history_table("players"))
+
+    # 삭제 후 다음 기록에서 같은 기간 테이블을 다시 만듦
+    run(db.save_game_result(room_id, "winner", 20, {"players": []}))
+    assert table in run(db.list_history_tables())
+    assert [row["pot_amount"] for row in run(db.get_history_chunk(table, 0, 10))] == [20]